@@ -8,9 +8,13 @@ from .fixtures import (
     browser_type,
     children,
     delete_teams_after_tests,
+    feature_flags_state_hash,
+    flipper_helper,
+    log_in_as,
     log_in_as_medical_secretary,
     log_in_as_nurse,
     log_in_as_prescriber,
+    log_in_storage_states,
     national_reporting_file_generator,
     national_reporting_healthcare_assistant,
     national_reporting_medical_secretary,
@@ -20,6 +24,7 @@ from .fixtures import (
     national_reporting_prescriber,
     national_reporting_superuser,
     national_reporting_team,
+    onboarded_tenant,
     point_of_care_clinics,
     point_of_care_file_generator,
     point_of_care_healthcare_assistant,
@@ -59,9 +64,13 @@ __all__ = [
     "browser_type",
     "children",
     "delete_teams_after_tests",
+    "feature_flags_state_hash",
+    "flipper_helper",
+    "log_in_as",
     "log_in_as_medical_secretary",
     "log_in_as_nurse",
     "log_in_as_prescriber",
+    "log_in_storage_states",
     "national_reporting_file_generator",
     "national_reporting_healthcare_assistant",
     "national_reporting_medical_secretary",
@@ -71,6 +80,7 @@ __all__ = [
     "national_reporting_prescriber",
     "national_reporting_superuser",
     "national_reporting_team",
+    "onboarded_tenant",
     "point_of_care_clinics",
     "point_of_care_file_generator",
     "point_of_care_healthcare_assistant",
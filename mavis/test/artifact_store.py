@@ -0,0 +1,132 @@
+import contextlib
+import hashlib
+import os
+import shutil
+from collections.abc import Callable
+from pathlib import Path
+
+from mavis.test.file_lock import FileLock
+
+DEFAULT_ARTIFACT_STORE_PATH = Path("working") / "artifacts"
+DEFAULT_MAX_MB = 500
+
+
+def _default_max_bytes() -> int:
+    return int(os.getenv("ARTIFACT_STORE_MAX_MB", str(DEFAULT_MAX_MB))) * 1024 * 1024
+
+
+class ArtifactStore:
+    """Content-addressed files shared by xdist workers, capped in size.
+
+    Entries are written to a temporary file and renamed into place, so readers
+    never see a partial file and concurrent writers of the same key are
+    harmless. Reading an entry touches it, and once the store is over its cap
+    the least recently used entries are evicted under a cross-worker lock.
+    Entries are copied or hard linked out rather than handed to callers, so
+    an eviction never removes a file that a test is still using.
+    """
+
+    def __init__(
+        self,
+        root: Path = DEFAULT_ARTIFACT_STORE_PATH,
+        max_bytes: int | None = None,
+    ) -> None:
+        self.root = root
+        self.max_bytes = _default_max_bytes() if max_bytes is None else max_bytes
+        self.lock = FileLock(root / ".lock")
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    def _entry_path(self, key: str, suffix: str) -> Path:
+        return self.root / f"{key}{suffix}"
+
+    def _temporary_path(self, key: str, suffix: str) -> Path:
+        return self.root / f".{key}.{os.getpid()}{suffix}"
+
+    def copy_or_create(
+        self, key: str, destination: Path, create: Callable[[Path], None]
+    ) -> Path:
+        """Copy the entry for `key` to `destination`, creating it if needed."""
+        entry = self._entry_path(key, destination.suffix)
+        try:
+            shutil.copyfile(entry, destination)
+        except FileNotFoundError:
+            pass
+        else:
+            self._record_hit(entry, destination.stat().st_size)
+            return destination
+
+        self.misses += 1
+        self.root.mkdir(parents=True, exist_ok=True)
+        temporary = self._temporary_path(key, destination.suffix)
+        create(temporary)
+        shutil.copyfile(temporary, destination)
+        temporary.replace(entry)
+        self._evict()
+        return destination
+
+    def deduplicate(self, path: Path) -> Path:
+        """Store a downloaded file, sharing its content with identical files.
+
+        `path` is left in place, hard linked to the entry for its content.
+        """
+        with path.open("rb") as file:
+            key = hashlib.file_digest(file, "sha256").hexdigest()
+        entry = self._entry_path(key, path.suffix)
+
+        if entry.exists():
+            size = path.stat().st_size
+            temporary = path.with_name(f".{path.name}.{os.getpid()}")
+            try:
+                temporary.hardlink_to(entry)
+            except FileNotFoundError:
+                pass  # evicted by another worker since the check
+            except OSError:
+                return path  # no hard links on this file system
+            else:
+                temporary.replace(path)
+                self._record_hit(entry, size)
+                return path
+
+        self.misses += 1
+        self.root.mkdir(parents=True, exist_ok=True)
+        temporary = self._temporary_path(key, path.suffix)
+        try:
+            temporary.hardlink_to(path)
+        except OSError:
+            shutil.copyfile(path, temporary)
+        temporary.replace(entry)
+        self._evict()
+        return path
+
+    def _record_hit(self, entry: Path, size: int) -> None:
+        self.hits += 1
+        self.bytes_saved += size
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(entry)
+
+    def _evict(self) -> None:
+        with self.lock:
+            entries = []
+            for entry in self.root.iterdir():
+                if entry.name.startswith("."):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, entry in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                entry.unlink(missing_ok=True)
+                total -= size
+
+    def __str__(self) -> str:
+        return f"{self.hits} hits, {self.misses} misses, {self.bytes_saved} bytes saved"
+
+
+artifact_store = ArtifactStore()
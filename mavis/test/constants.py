@@ -3,9 +3,7 @@ import urllib.parse
 from datetime import date
 from enum import StrEnum
 
-from faker import Faker
-
-faker = Faker("en_GB")
+from mavis.test.identities import identity_pool
 
 MAVIS_NOTE_LENGTH_LIMIT = 1000
 
@@ -513,10 +511,10 @@ class Relationship(StrEnum):
     @property
     def generate_name(self) -> str:
         if self is Relationship.DAD:
-            return faker.name_male()
+            return identity_pool.name_male()
         if self is Relationship.MUM:
-            return faker.name_female()
-        return faker.name_nonbinary()
+            return identity_pool.name_female()
+        return identity_pool.name_nonbinary()
 
 
 class ImmsEndpoints(StrEnum):
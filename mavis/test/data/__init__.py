@@ -11,6 +11,7 @@ from .file_utils import (
     increment_date_of_birth_for_records,
     read_scenario_list_from_file,
 )
+from .template_renderer import template_cache
 
 __all__ = [
     "ChildFileMapping",
@@ -22,4 +23,5 @@ __all__ = [
     "get_session_id",
     "increment_date_of_birth_for_records",
     "read_scenario_list_from_file",
+    "template_cache",
 ]
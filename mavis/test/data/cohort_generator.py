@@ -0,0 +1,244 @@
+"""Generate large cohort CSV files for the performance tests.
+
+Usage:
+    uv run python -m mavis.test.data.cohort_generator \\
+        --count 1000000 --seed 42 --output cohort.csv.gz
+
+Rows have the same columns as performance-tests/STS/SourceCohort.csv and the
+output is identical for a given seed, count and shard size, regardless of how
+many processes are used to generate it.
+"""
+
+import argparse
+import codecs
+import csv
+import gzip
+import io
+import math
+import random
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import IO
+
+from mavis.test import utils
+from mavis.test.constants import Relationship
+from mavis.test.data_models import Child, Parent
+from mavis.test.identities import identity_pool
+from mavis.test.nhs_numbers import SYNTHETIC_BASE_COUNT, nhs_number_pool
+
+COHORT_COLUMNS = [
+    "CHILD_ADDRESS_LINE_1",
+    "CHILD_ADDRESS_LINE_2",
+    "CHILD_POSTCODE",
+    "CHILD_TOWN",
+    "CHILD_PREFERRED_GIVEN_NAME",
+    "CHILD_DATE_OF_BIRTH",
+    "CHILD_FIRST_NAME",
+    "CHILD_LAST_NAME",
+    "CHILD_NHS_NUMBER",
+    "PARENT_1_EMAIL",
+    "PARENT_1_NAME",
+    "PARENT_1_PHONE",
+    "PARENT_1_RELATIONSHIP",
+    "PARENT_2_EMAIL",
+    "PARENT_2_NAME",
+    "PARENT_2_PHONE",
+    "PARENT_2_RELATIONSHIP",
+    "CHILD_SCHOOL_URN",
+]
+
+COHORT_RELATIONSHIPS = {
+    Relationship.DAD: "father",
+    Relationship.MUM: "mother",
+    Relationship.GUARDIAN: "guardian",
+}
+
+PERFORMANCE_TESTS_PATH = Path(__file__).parents[3] / "performance-tests"
+DEFAULT_SCHOOLS_PATH = PERFORMANCE_TESTS_PATH / "large-org" / "schools.csv"
+DEFAULT_SHARD_SIZE = 50_000
+
+
+def read_school_urns(path: Path) -> list[str]:
+    """Read URNs from large-org/schools.csv or large-org/URNList.csv.
+
+    schools.csv has the URN in its last column (school names are not quoted
+    and may contain commas), while URNList.csv is UTF-16 with one URN per line.
+    """
+    is_utf16 = path.read_bytes()[:2] in (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
+
+    with path.open(encoding="utf-16" if is_utf16 else "utf-8-sig") as file:
+        urns = [line.rsplit(",", 1)[-1].strip() for line in file if line.strip()]
+
+    if not urns:
+        msg = f"No school URNs found in {path}"
+        raise ValueError(msg)
+    return urns
+
+
+def _seed_generators(seed: str, nhs_number_start: int) -> random.Random:
+    # Child and Parent draw from the identity and NHS number pools and from
+    # the Faker instance used for dates of birth, so all of them are seeded
+    utils.faker.seed_instance(seed)
+    identity_pool.seed(seed)
+    nhs_number_pool.seed(seed, start=nhs_number_start)
+    return random.Random(seed)
+
+
+def _parent_columns(parent: Parent, rng: random.Random) -> list[str]:
+    return [
+        parent.email_address,
+        parent.full_name,
+        f"07700 900{rng.randrange(1000):03d}",
+        COHORT_RELATIONSHIPS.get(parent.relationship, "other"),
+    ]
+
+
+def cohort_row(child: Child, urn: str, rng: random.Random) -> list[str]:
+    return [
+        child.address[0],
+        child.address[1],
+        child.address[3],
+        child.address[2],
+        "",
+        child.date_of_birth.strftime("%Y-%m-%d"),
+        child.first_name,
+        child.last_name,
+        child.nhs_number,
+        *_parent_columns(child.parents[0], rng),
+        *_parent_columns(child.parents[1], rng),
+        urn,
+    ]
+
+
+def _open_output(path: Path, *, compress: bool) -> IO[str]:
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return path.open("w", encoding="utf-8", newline="")
+
+
+def write_shard(  # noqa: PLR0913
+    path: Path,
+    seed: int,
+    shard: int,
+    count: int,
+    nhs_number_start: int,
+    year_groups: list[int],
+    urns: list[str],
+    *,
+    compress: bool,
+) -> Path:
+    rng = _seed_generators(f"{seed}-{shard}", nhs_number_start)
+
+    with _open_output(path, compress=compress) as file:
+        writer = csv.writer(file, lineterminator="\n")
+        for _ in range(count):
+            child = Child.generate(rng.choice(year_groups))
+            writer.writerow(cohort_row(child, rng.choice(urns), rng))
+
+    return path
+
+
+def generate_cohort(  # noqa: PLR0913
+    output: Path,
+    count: int,
+    seed: int,
+    year_groups: list[int],
+    urns: list[str],
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    processes: int | None = None,
+) -> None:
+    """Stream a cohort of `count` children to `output`.
+
+    Each shard is written to its own temporary file by a worker process and
+    the shards are then concatenated in order, so memory use is bounded by a
+    single row per process. Concatenated gzip members form a valid gzip file,
+    so compressed shards are joined without being decompressed.
+
+    Each shard draws NHS numbers from its own range of synthetic numbers, twice
+    the shard size rounded up to whole pool blocks, so they never repeat.
+    """
+    compress = output.suffix == ".gz"
+    shard_counts = [
+        min(shard_size, count - start) for start in range(0, count, shard_size)
+    ]
+
+    block_size = nhs_number_pool.block_size
+    shard_nhs_numbers = math.ceil(2 * shard_size / block_size) * block_size
+    if shard_nhs_numbers * len(shard_counts) > SYNTHETIC_BASE_COUNT:
+        msg = f"Not enough synthetic NHS numbers for {count} children"
+        raise ValueError(msg)
+    nhs_number_offset = random.Random(seed).randrange(SYNTHETIC_BASE_COUNT)
+
+    with tempfile.TemporaryDirectory(dir=output.parent) as directory:
+        header_path = Path(directory) / "header"
+        with _open_output(header_path, compress=compress) as file:
+            csv.writer(file, lineterminator="\n").writerow(COHORT_COLUMNS)
+
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [
+                executor.submit(
+                    write_shard,
+                    Path(directory) / f"shard_{shard}",
+                    seed,
+                    shard,
+                    shard_count,
+                    nhs_number_offset + shard * shard_nhs_numbers,
+                    year_groups,
+                    urns,
+                    compress=compress,
+                )
+                for shard, shard_count in enumerate(shard_counts)
+            ]
+
+            with output.open("wb") as output_file:
+                _copy_into(header_path, output_file)
+                for future in futures:
+                    _copy_into(future.result(), output_file)
+
+
+def _copy_into(path: Path, output_file: io.BufferedWriter) -> None:
+    with path.open("rb") as file:
+        shutil.copyfileobj(file, output_file)
+    path.unlink()
+
+
+def parse_year_groups(value: str) -> list[int]:
+    return [int(year_group) for year_group in value.split(",")]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, required=True)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        required=True,
+        help="CSV file to write; a .gz suffix writes gzip compressed output",
+    )
+    parser.add_argument(
+        "--schools",
+        type=Path,
+        default=DEFAULT_SCHOOLS_PATH,
+        help="large-org/schools.csv or large-org/URNList.csv",
+    )
+    parser.add_argument("--year-groups", type=parse_year_groups, default=[8, 9, 10, 11])
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE)
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    generate_cohort(
+        output=args.output,
+        count=args.count,
+        seed=args.seed,
+        year_groups=args.year_groups,
+        urns=read_school_urns(args.schools),
+        shard_size=args.shard_size,
+        processes=args.processes,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Generate synthetic FHIR Immunization resources in bulk for the IMMS API.
+
+Usage:
+    uv run python -m mavis.test.data.fhir_immunizations \\
+        --count 10000 --seed 42 --output immunizations.ndjson
+
+A .json output is written as FHIR transaction Bundles, one per line, each
+holding up to --bundle-size Immunization resources.
+"""
+
+import argparse
+import random
+from collections.abc import Iterable, Iterator
+from datetime import timedelta
+from pathlib import Path
+from typing import IO
+
+from mavis.test import utils
+from mavis.test.constants import DeliverySite, Vaccine
+from mavis.test.data.cohort_generator import (
+    DEFAULT_SCHOOLS_PATH,
+    parse_year_groups,
+    read_school_urns,
+)
+from mavis.test.data.immunization_builder import (
+    DEFAULT_BUNDLE_SIZE,
+    ImmunizationSpec,
+    fhir_immunization_builder,
+)
+from mavis.test.data_models import Child, School
+from mavis.test.identities import identity_pool
+from mavis.test.nhs_numbers import SYNTHETIC_BASE_COUNT, nhs_number_pool
+
+# vaccines with an IMMS API code, and where each of them is given
+IMMS_API_VACCINES = {
+    Vaccine.FLUENZ: [DeliverySite.NOSE],
+    Vaccine.SEQUIRUS: [DeliverySite.LEFT_ARM_UPPER, DeliverySite.RIGHT_ARM_UPPER],
+    Vaccine.GARDASIL_9: [DeliverySite.LEFT_ARM_UPPER, DeliverySite.RIGHT_ARM_UPPER],
+}
+
+
+def generate_immunization_specs(
+    count: int, urns: list[str], year_groups: list[int], seed: int
+) -> Iterator[ImmunizationSpec]:
+    """Synthetic children vaccinated at random schools over the last 30 days."""
+    rng = random.Random(seed)
+    utils.faker.seed_instance(seed)
+    identity_pool.seed(seed)
+    nhs_number_pool.seed(seed, start=rng.randrange(SYNTHETIC_BASE_COUNT))
+    now = utils.get_current_datetime().replace(microsecond=0)
+
+    for _ in range(count):
+        vaccine = rng.choice(list(IMMS_API_VACCINES))
+        urn = rng.choice(urns)
+        yield ImmunizationSpec(
+            vaccine=vaccine,
+            child=Child.generate(rng.choice(year_groups)),
+            school=School(
+                name=urn,
+                urn=urn,
+                site="",
+                address_line_1="",
+                address_line_2="",
+                address_town="",
+                address_postcode="",
+            ),
+            delivery_site=rng.choice(IMMS_API_VACCINES[vaccine]),
+            vaccination_time=now - timedelta(seconds=rng.randrange(30 * 24 * 3600)),
+        )
+
+
+def write_immunizations(
+    file: IO[str],
+    specs: Iterable[ImmunizationSpec],
+    *,
+    bundle_size: int | None = None,
+) -> None:
+    """Write specs as NDJSON, or as one transaction Bundle per line."""
+    if bundle_size is None:
+        lines = fhir_immunization_builder.iter_ndjson(specs)
+    else:
+        lines = (
+            bundle + "\n"
+            for bundle in fhir_immunization_builder.iter_transaction_bundles(
+                specs, bundle_size
+            )
+        )
+    file.writelines(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, required=True)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        required=True,
+        help=".ndjson for one Immunization per line, .json for transaction Bundles",
+    )
+    parser.add_argument("--bundle-size", type=int, default=DEFAULT_BUNDLE_SIZE)
+    parser.add_argument("--schools", type=Path, default=DEFAULT_SCHOOLS_PATH)
+    parser.add_argument("--year-groups", type=parse_year_groups, default=[8, 9, 10, 11])
+    args = parser.parse_args()
+
+    specs = generate_immunization_specs(
+        args.count, read_school_urns(args.schools), args.year_groups, args.seed
+    )
+    with args.output.open("w", encoding="utf-8") as file:
+        write_immunizations(
+            file,
+            specs,
+            bundle_size=None if args.output.suffix == ".ndjson" else args.bundle_size,
+        )
+
+
+if __name__ == "__main__":
+    main()
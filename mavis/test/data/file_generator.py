@@ -3,13 +3,13 @@ import os
 from collections.abc import Callable
 from pathlib import Path
 
-import nhs_number
-import pandas as pd
-from faker import Faker
-
+from mavis.test.artifact_store import artifact_store
 from mavis.test.constants import Programme
 from mavis.test.data.file_mappings import FileMapping
+from mavis.test.data.template_renderer import template_cache
 from mavis.test.data_models import Child, Clinic, Organisation, School, User
+from mavis.test.identities import identity_pool
+from mavis.test.nhs_numbers import nhs_number_pool
 from mavis.test.utils import (
     get_current_datetime_compact,
     get_current_time_hms_format,
@@ -37,8 +37,6 @@ class FileGenerator:
         self.clinics = clinics
         self.year_groups = year_groups
 
-        self.faker = Faker(locale="en_GB")
-
         self.create_working_directory()
 
     def create_working_directory(self) -> None:
@@ -66,30 +64,25 @@ class FileGenerator:
         output_filename = f"{file_name_prefix}{get_current_datetime_compact()}.csv"
         output_path = self.working_path / output_filename
 
-        if (self.template_path / template_path).stat().st_size > 0:
-            template_df = pd.read_csv(self.template_path / template_path, dtype=str)
-            template_df = self.replace_substrings_in_df(
-                template_df,
-                file_replacements,
-            )
-            template_df = template_df.apply(
-                lambda col: col.apply(
-                    lambda x: (
-                        line_replacements[x.strip()]()
-                        if isinstance(x, str) and x.strip() in line_replacements
-                        else x
-                    ),
-                ),
-            )
-            template_df.to_csv(
-                path_or_buf=output_path,
+        template = template_cache.get(self.template_path / template_path)
+        if template is None:
+            output_path.touch()
+            return output_path
+
+        def render(path: Path) -> None:
+            rendered_df = template.render(file_replacements, line_replacements)
+            rendered_df.to_csv(
+                path_or_buf=path,
                 quoting=csv.QUOTE_MINIMAL,
                 encoding="utf-8",
                 index=False,
             )
-        else:
-            output_path.touch()
-        return output_path
+
+        render_key = template.render_key(file_replacements, line_replacements)
+        if render_key is None:
+            render(output_path)
+            return output_path
+        return artifact_store.copy_or_create(render_key, output_path, render)
 
     def create_file_replacements_dict(
         self, programme_group: str, session_id: str | None
@@ -190,15 +183,13 @@ class FileGenerator:
     def create_line_replacements_dict(
         self, programme_group: str
     ) -> dict[str, Callable[[], str]]:
-        # ruff: disable[PLW0108]
         line_replacements = {
-            "<<RANDOM_FNAME>>": lambda: self.faker.first_name(),
-            "<<RANDOM_LNAME>>": lambda: self.faker.last_name().upper(),
+            "<<RANDOM_FNAME>>": identity_pool.first_name,
+            "<<RANDOM_LNAME>>": lambda: identity_pool.last_name().upper(),
             "<<RANDOM_NHS_NO>>": lambda: self.get_new_nhs_no(valid=True),
             "<<INVALID_NHS_NO>>": lambda: self.get_new_nhs_no(valid=False),
-            "<<RANDOM_POSTCODE>>": lambda: self.faker.postcode(),
+            "<<RANDOM_POSTCODE>>": identity_pool.postcode,
         }
-        # ruff: enable[PLW0108]
 
         if self.year_groups:
             fixed_year_group = self.year_groups[programme_group]
@@ -208,30 +199,8 @@ class FileGenerator:
 
         return line_replacements
 
-    def replace_substrings_in_df(
-        self, df: pd.DataFrame, replacements: dict[str, str]
-    ) -> pd.DataFrame:
-        def replace_substrings(cell: object) -> object:
-            if isinstance(cell, str):
-                for old, new in replacements.items():
-                    if old and new:
-                        cell = cell.replace(old, new)
-            return cell
-
-        for col in df.columns:
-            df[col] = df[col].map(replace_substrings)
-        return df
-
     def get_new_nhs_no(self, *, valid: bool = True) -> str:
-        nhs_numbers = nhs_number.generate(
-            valid=valid,
-            for_region=nhs_number.REGION_SYNTHETIC,
-            quantity=1,
-        )
-        if not nhs_numbers:
-            exception_message = "Failed to generate NHS number."
-            raise ValueError(exception_message)
-        return str(nhs_numbers[0])
+        return nhs_number_pool.get(valid=valid)
 
     def get_expected_errors(self, file_path: Path) -> list[str] | None:
         file_content = self.read_file(file_path)
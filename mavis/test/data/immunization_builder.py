@@ -0,0 +1,124 @@
+import json
+import uuid
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime
+from itertools import batched
+from pathlib import Path
+from typing import NamedTuple
+
+from mavis.test import utils
+from mavis.test.constants import DeliverySite, Vaccine
+from mavis.test.data.template_renderer import PLACEHOLDER_PATTERN
+from mavis.test.data_models import Child, School
+
+FHIR_IMMUNIZATION_TEMPLATE_PATH = (
+    Path(__file__).parent / "fhir_immunization_template.json.template"
+)
+FHIR_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S+00:00"
+DEFAULT_BUNDLE_SIZE = 100
+
+
+class ImmunizationSpec(NamedTuple):
+    vaccine: Vaccine
+    child: Child
+    school: School
+    delivery_site: DeliverySite
+    vaccination_time: datetime
+
+
+def _format_fhir_datetime(value: datetime) -> str:
+    # the format has a fixed UTC offset, so aware times are converted to UTC
+    if value.tzinfo is not None:
+        value = value.astimezone(UTC)
+    return value.strftime(FHIR_DATETIME_FORMAT)
+
+
+class FhirImmunizationBuilder:
+    """The Immunization template, compiled once into compact JSON parts.
+
+    Placeholders only ever appear inside JSON strings, so a resource is built
+    by joining the literal parts with JSON-escaped values. Nothing is parsed
+    per resource unless a dict is asked for.
+    """
+
+    def __init__(self, template_path: Path = FHIR_IMMUNIZATION_TEMPLATE_PATH) -> None:
+        compact = json.dumps(
+            json.loads(template_path.read_text()), separators=(",", ":")
+        )
+        # literal JSON and placeholders alternate, so placeholders sit at odd
+        # indices
+        self.parts = PLACEHOLDER_PATTERN.split(compact)
+
+    @staticmethod
+    def replacements(
+        spec: ImmunizationSpec, immunization_id: str, recorded_time: datetime
+    ) -> dict[str, str]:
+        vaccine, child = spec.vaccine, spec.child
+        return {
+            "<<IMMUNIZATION_ID>>": immunization_id,
+            "<<VACCINE_CODE>>": vaccine.imms_api_code,
+            "<<VACCINE_NAME>>": vaccine.name,
+            "<<PATIENT_NHS_NUMBER>>": child.nhs_number,
+            "<<PATIENT_FAMILY_NAME>>": child.last_name,
+            "<<PATIENT_GIVEN_NAME>>": child.first_name,
+            "<<PATIENT_GENDER>>": "unknown",  # Child model doesn't have gender
+            "<<PATIENT_BIRTH_DATE>>": child.date_of_birth.strftime("%Y-%m-%d"),
+            "<<PATIENT_POSTAL_CODE>>": child.address[3],
+            "<<VACCINATION_TIME>>": _format_fhir_datetime(spec.vaccination_time),
+            "<<RECORDED_TIME>>": _format_fhir_datetime(recorded_time),
+            "<<SCHOOL_URN>>": spec.school.urn,
+            "<<DELIVERY_SITE_CODE>>": spec.delivery_site.imms_api_code,
+            "<<DELIVERY_SITE_DISPLAY>>": spec.delivery_site.value,
+            "<<TARGET_DISEASE_CODE>>": vaccine.target_disease_code,
+            "<<TARGET_DISEASE_DISPLAY>>": vaccine.target_disease_display,
+        }
+
+    def render(
+        self,
+        spec: ImmunizationSpec,
+        immunization_id: str | None = None,
+        recorded_time: datetime | None = None,
+    ) -> str:
+        replacements = self.replacements(
+            spec,
+            immunization_id or str(uuid.uuid4()),
+            recorded_time or utils.get_current_datetime(),
+        )
+        return "".join(
+            json.dumps(replacements[part])[1:-1] if index % 2 else part
+            for index, part in enumerate(self.parts)
+        )
+
+    def build(self, spec: ImmunizationSpec) -> dict:
+        return json.loads(self.render(spec))
+
+    def render_transaction_bundle(self, specs: Iterable[ImmunizationSpec]) -> str:
+        """One FHIR transaction Bundle creating an Immunization per spec."""
+        recorded_time = utils.get_current_datetime()
+        entries = []
+        for spec in specs:
+            immunization_id = str(uuid.uuid4())
+            resource = self.render(spec, immunization_id, recorded_time)
+            entries.append(
+                f'{{"fullUrl":"urn:uuid:{immunization_id}","resource":{resource},'
+                '"request":{"method":"POST","url":"Immunization"}}'
+            )
+        return (
+            '{"resourceType":"Bundle","type":"transaction","entry":['
+            + ",".join(entries)
+            + "]}"
+        )
+
+    def iter_transaction_bundles(
+        self, specs: Iterable[ImmunizationSpec], bundle_size: int = DEFAULT_BUNDLE_SIZE
+    ) -> Iterator[str]:
+        for batch in batched(specs, bundle_size, strict=False):
+            yield self.render_transaction_bundle(batch)
+
+    def iter_ndjson(self, specs: Iterable[ImmunizationSpec]) -> Iterator[str]:
+        recorded_time = utils.get_current_datetime()
+        for spec in specs:
+            yield self.render(spec, recorded_time=recorded_time) + "\n"
+
+
+fhir_immunization_builder = FhirImmunizationBuilder()
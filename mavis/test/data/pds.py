@@ -1,9 +1,9 @@
+import bisect
 import csv
 import random
-from datetime import date, datetime
+from datetime import date
 from pathlib import Path
 from typing import NamedTuple
-from zoneinfo import ZoneInfo
 
 from dateutil.relativedelta import relativedelta
 
@@ -32,9 +32,7 @@ class Patient(NamedTuple):
 
         return cls(
             nhs_number=row["NHS_NUMBER"],
-            date_of_birth=datetime.strptime(row["DATE_OF_BIRTH"], "%Y%m%d")
-            .replace(tzinfo=ZoneInfo("Europe/London"))
-            .date(),
+            date_of_birth=date.fromisoformat(row["DATE_OF_BIRTH"]),
             family_name=row["FAMILY_NAME"],
             given_name=row["GIVEN_NAME"],
             address_line_1=address_parts[0],
@@ -42,9 +40,7 @@ class Patient(NamedTuple):
             address_town=row["ADDRESS_LINE_4"],
             address_postcode=row["POST_CODE"],
             date_of_death=(
-                datetime.strptime(date_of_death_string, "%Y%m%d")
-                .replace(tzinfo=ZoneInfo("Europe/London"))
-                .date()
+                date.fromisoformat(date_of_death_string)
                 if date_of_death_string
                 else None
             ),
@@ -64,32 +60,76 @@ class Patient(NamedTuple):
         )
 
 
-with (Path(__file__).parent / "pds.csv").open(newline="") as file:
-    reader = csv.DictReader(file)
-    patients = [Patient.from_csv_row(row) for row in reader]
+class PdsPatientStore:
+    """Patients from a PDS extract, loaded on first use and indexed.
 
+    Living patients are kept sorted by date of birth, so the patients born
+    on or after a cutoff are a suffix of that list found by bisection, and
+    sampling from them is a random index rather than a filtered copy.
+    """
 
-def get_random_child_patient_without_date_of_death() -> Child:
-    patients_without_date_of_death = [
-        patient for patient in patients if not patient.date_of_death
-    ]
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._patients: list[Patient] | None = None
+        self._living_patients: list[Patient] = []
+        self._living_dates_of_birth: list[date] = []
 
-    cutoff_date = get_todays_date() - relativedelta(years=22)
+    @property
+    def patients(self) -> list[Patient]:
+        if self._patients is None:
+            self._load()
+        return self._patients
+
+    def _load(self) -> None:
+        with self.path.open(newline="") as file:
+            reader = csv.DictReader(file)
+            self._patients = [Patient.from_csv_row(row) for row in reader]
+
+        self._living_patients = sorted(
+            (patient for patient in self._patients if not patient.date_of_death),
+            key=lambda patient: patient.date_of_birth,
+        )
+        self._living_dates_of_birth = [
+            patient.date_of_birth for patient in self._living_patients
+        ]
+
+    def _living_born_on_or_after(self, cutoff_date: date) -> range:
+        if self._patients is None:
+            self._load()
+        start = bisect.bisect_left(self._living_dates_of_birth, cutoff_date)
+        return range(start, len(self._living_patients))
+
+    def sample_living(self, cutoff_date: date, k: int = 1) -> list[Patient]:
+        indexes = self._living_born_on_or_after(cutoff_date)
+        if len(indexes) < k:
+            msg = f"Only {len(indexes)} living patients born since {cutoff_date}"
+            raise ValueError(msg)
+        return [self._living_patients[index] for index in random.sample(indexes, k)]
 
-    child_patients_without_date_of_death = [
-        patient
-        for patient in patients_without_date_of_death
-        if patient.date_of_birth >= cutoff_date
-    ]
 
-    child = random.choice(child_patients_without_date_of_death)
+pds_store = PdsPatientStore(Path(__file__).parent / "pds.csv")
 
+
+def _child_from_patient(patient: Patient) -> Child:
     return Child(
-        child.given_name,
-        child.family_name,
-        child.nhs_number,
-        child.address,
-        child.date_of_birth,
+        patient.given_name,
+        patient.family_name,
+        patient.nhs_number,
+        patient.address,
+        patient.date_of_birth,
         9,
         (Parent.get(Relationship.DAD), Parent.get(Relationship.MUM)),
     )
+
+
+def get_random_child_patients_without_date_of_death(k: int) -> list[Child]:
+    cutoff_date = get_todays_date() - relativedelta(years=22)
+
+    return [
+        _child_from_patient(patient)
+        for patient in pds_store.sample_living(cutoff_date, k)
+    ]
+
+
+def get_random_child_patient_without_date_of_death() -> Child:
+    return get_random_child_patients_without_date_of_death(1)[0]
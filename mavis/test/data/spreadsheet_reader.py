@@ -0,0 +1,54 @@
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+
+from openpyxl import load_workbook
+
+OFFLINE_RECORDING_SHEET = "Vaccinations"
+
+type SpreadsheetRow = dict[str, str | None]
+
+
+def _cell_text(value: object) -> str | None:
+    # Matches pd.read_excel(dtype=str): blank cells are missing, dates are
+    # formatted as "YYYY-MM-DD HH:MM:SS" and whole numbers have no ".0"
+    if value is None or value == "":
+        return None
+    return str(value)
+
+
+def iter_spreadsheet_rows(
+    path: Path,
+    sheet_name: str = OFFLINE_RECORDING_SHEET,
+    columns: Sequence[str] | None = None,
+) -> Iterator[SpreadsheetRow]:
+    """Lazily yield the rows of an XLSX sheet as column name to text mappings.
+
+    The workbook is opened read-only, so rows are parsed as they are consumed
+    and nothing past the last row read is loaded. Only `columns` are included
+    when given. Close the iterator (or exhaust it) to release the file.
+    """
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name]
+        header_row = next(sheet.iter_rows(max_row=1, values_only=True), ())
+        header = [_cell_text(name) for name in header_row]
+
+        if columns is None:
+            selected = [(index, name) for index, name in enumerate(header) if name]
+        else:
+            missing = [column for column in columns if column not in header]
+            if missing:
+                msg = f"Columns {missing} not found in {sheet_name} sheet of {path}"
+                raise KeyError(msg)
+            selected = [(header.index(column), column) for column in columns]
+
+        # cells to the right of the last selected column are never built
+        last_column = max((index for index, _ in selected), default=0) + 1
+        rows = sheet.iter_rows(min_row=2, max_col=last_column, values_only=True)
+        for row in rows:
+            yield {
+                name: _cell_text(row[index]) if index < len(row) else None
+                for index, name in selected
+            }
+    finally:
+        workbook.close()
@@ -0,0 +1,158 @@
+import hashlib
+import re
+from collections.abc import Callable, Mapping
+from pathlib import Path
+from typing import NamedTuple
+
+import pandas as pd
+
+PLACEHOLDER_PATTERN = re.compile(r"(<<[A-Z0-9_]+>>)")
+
+# renders are kept in the artifact store across runs, so their keys include
+# the code that renders and writes them, and the pandas version writing the CSV
+RENDER_CODE_DIGEST = hashlib.sha256(
+    b"".join(
+        (Path(__file__).parent / name).read_bytes()
+        for name in ("template_renderer.py", "file_generator.py")
+    )
+    + pd.__version__.encode()
+).hexdigest()
+
+
+class CompiledCell(NamedTuple):
+    # literal text and placeholders alternate, so placeholders sit at odd indices
+    parts: tuple[str, ...]
+    line_key: str | None
+
+    @classmethod
+    def compile(cls, cell: str) -> "CompiledCell":
+        stripped = cell.strip()
+        line_key = stripped if PLACEHOLDER_PATTERN.fullmatch(stripped) else None
+        return cls(parts=tuple(PLACEHOLDER_PATTERN.split(cell)), line_key=line_key)
+
+    def render(
+        self,
+        replacements: Mapping[str, str],
+        line_replacements: Mapping[str, Callable[[], str]],
+    ) -> str:
+        if self.line_key is not None and self.line_key in line_replacements:
+            return line_replacements[self.line_key]()
+
+        if len(self.parts) == 1:
+            return self.parts[0]
+
+        parts = list(self.parts)
+        for index in range(1, len(parts), 2):
+            parts[index] = replacements.get(parts[index], parts[index])
+        return "".join(parts)
+
+
+class CompiledTemplate:
+    """A CSV template tokenised once into literals and placeholders.
+
+    Rendering substitutes every placeholder in a single pass over the cells,
+    so the cost is linear in the size of the template rather than in
+    cells multiplied by the number of known placeholders.
+    """
+
+    def __init__(
+        self, columns: list[str], rows: list[list[CompiledCell | None]]
+    ) -> None:
+        self.columns = columns
+        self.rows = rows
+
+        cells = [cell for row in rows for cell in row if cell is not None]
+        self.placeholders = {part for cell in cells for part in cell.parts[1::2]}
+        self.line_keys = {cell.line_key for cell in cells if cell.line_key}
+        self.digest = hashlib.sha256(repr((columns, rows)).encode()).hexdigest()
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "CompiledTemplate":
+        rows = [
+            [
+                CompiledCell.compile(cell) if isinstance(cell, str) else None
+                for cell in row
+            ]
+            for row in df.itertuples(index=False, name=None)
+        ]
+        return cls(columns=list(df.columns), rows=rows)
+
+    @classmethod
+    def from_path(cls, path: Path) -> "CompiledTemplate":
+        return cls.from_dataframe(pd.read_csv(path, dtype=str))
+
+    def render_key(
+        self,
+        replacements: Mapping[str, str],
+        line_replacements: Mapping[str, Callable[[], str]],
+    ) -> str | None:
+        """Identify a render by its inputs, or None if any line is random."""
+        if not self.line_keys.isdisjoint(line_replacements):
+            return None
+
+        used = sorted(
+            (old, new)
+            for old, new in replacements.items()
+            if old in self.placeholders and new
+        )
+        return hashlib.sha256(
+            repr((RENDER_CODE_DIGEST, self.digest, used)).encode()
+        ).hexdigest()
+
+    def render(
+        self,
+        replacements: Mapping[str, str],
+        line_replacements: Mapping[str, Callable[[], str]],
+    ) -> pd.DataFrame:
+        # empty values are never substituted, leaving the placeholder in place
+        replacements = {old: new for old, new in replacements.items() if old and new}
+
+        rendered_rows = [
+            [
+                cell.render(replacements, line_replacements)
+                if cell is not None
+                else None
+                for cell in row
+            ]
+            for row in self.rows
+        ]
+        return pd.DataFrame(rendered_rows, columns=self.columns)
+
+
+class TemplateCache:
+    """Per-process cache of compiled templates keyed by path and mtime.
+
+    Empty templates are cached as None so that callers can skip rendering
+    without another stat() call.
+    """
+
+    def __init__(self) -> None:
+        self._templates: dict[Path, tuple[int, CompiledTemplate | None]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: Path) -> CompiledTemplate | None:
+        stat = path.stat()
+        cached = self._templates.get(path)
+        if cached is not None and cached[0] == stat.st_mtime_ns:
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        template = CompiledTemplate.from_path(path) if stat.st_size > 0 else None
+        self._templates[path] = (stat.st_mtime_ns, template)
+        return template
+
+    def clear(self) -> None:
+        self._templates.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.hits} hits, {self.misses} misses, "
+            f"{len(self._templates)} templates cached"
+        )
+
+
+template_cache = TemplateCache()
@@ -1,10 +1,8 @@
+import functools
 import random
-import urllib.parse
 from abc import ABC, abstractmethod
 from datetime import date
 
-import nhs_number
-import requests
 from attr import dataclass
 from faker import Faker
 
@@ -14,9 +12,11 @@ from mavis.test.constants import (
     Programme,
     Relationship,
 )
+from mavis.test.identities import identity_pool
+from mavis.test.nhs_numbers import nhs_number_pool
+from mavis.test.testing_api import get_testing_api_client, run_concurrently
 from mavis.test.utils import (
     get_date_of_birth_for_year_group,
-    normalize_postcode,
     normalize_whitespace,
 )
 
@@ -68,8 +68,9 @@ class School(Location):
     def get_from_testing_api(
         cls, base_url: str, year_groups: dict[str, int]
     ) -> "dict[str, list[School]]":
-        def _get_schools_with_year_group(year_group: int) -> list[School]:
-            url = urllib.parse.urljoin(base_url, "api/testing/locations")
+        client = get_testing_api_client(base_url)
+
+        def _get_schools_data_with_year_group(year_group: int) -> list[dict]:
             params = {
                 "type": "school",
                 "status": "open",
@@ -77,13 +78,25 @@ class School(Location):
                 "gias_year_groups[]": [str(year_group)],
                 "site": "",
             }
+            # not cached, as other workers and runs attach schools to their teams
+            return client.get_json("api/testing/locations", params=params)
+
+        # programme groups often share a year group, which is fetched once
+        distinct_year_groups = sorted(set(year_groups.values()))
+        schools_data_by_year_group = dict(
+            zip(
+                distinct_year_groups,
+                run_concurrently(
+                    *(
+                        functools.partial(_get_schools_data_with_year_group, it)
+                        for it in distinct_year_groups
+                    )
+                ),
+                strict=True,
+            )
+        )
 
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-
-            data = response.json()
-            schools_data = random.choices(data, k=2)
-
+        def _choose_schools(schools_data: list[dict]) -> list[School]:
             return [
                 School(
                     name=normalize_whitespace(school_data["name"]),
@@ -94,11 +107,13 @@ class School(Location):
                     address_town=school_data["address_town"],
                     address_postcode=school_data["address_postcode"],
                 )
-                for school_data in schools_data
+                for school_data in random.choices(schools_data, k=2)
             ]
 
         return {
-            programme.group: _get_schools_with_year_group(year_groups[programme.group])
+            programme.group: _choose_schools(
+                schools_data_by_year_group[year_groups[programme.group]]
+            )
             for programme in Programme
         }
 
@@ -262,7 +277,7 @@ class Parent:
         return cls(
             full_name=relationship.generate_name,
             relationship=relationship,
-            email_address=faker.email(),
+            email_address=identity_pool.email(),
         )
 
 
@@ -286,17 +301,10 @@ class Child:
     @classmethod
     def generate(cls, year_group: int) -> "Child":
         return cls(
-            first_name=faker.first_name(),
-            last_name=faker.last_name().upper(),
-            nhs_number=nhs_number.generate(
-                for_region=nhs_number.REGION_SYNTHETIC,
-            )[0],
-            address=(
-                faker.secondary_address(),
-                faker.street_name(),
-                faker.city(),
-                normalize_postcode(faker.postcode()),
-            ),
+            first_name=identity_pool.first_name(),
+            last_name=identity_pool.last_name().upper(),
+            nhs_number=nhs_number_pool.get(),
+            address=identity_pool.address(),
             date_of_birth=get_date_of_birth_for_year_group(year_group),
             year_group=year_group,
             parents=(Parent.get(Relationship.DAD), Parent.get(Relationship.MUM)),
@@ -0,0 +1,68 @@
+import os
+import time
+from pathlib import Path
+from types import TracebackType
+from typing import Self
+
+
+class FileLock:
+    """A lock shared between xdist workers, held by creating a lock file.
+
+    Exclusive file creation works on both Linux and Windows, unlike fcntl. A
+    lock file older than `stale_after` seconds is assumed to belong to a worker
+    that died while holding it and is removed.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        timeout: float = 60,
+        poll_interval: float = 0.05,
+        stale_after: float = 120,
+    ) -> None:
+        self.path = path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+
+    def acquire(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        deadline = time.monotonic() + self.timeout
+
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                self._remove_if_stale()
+            else:
+                os.write(fd, str(os.getpid()).encode())
+                os.close(fd)
+                return
+
+            if time.monotonic() > deadline:
+                msg = f"Timed out after {self.timeout}s waiting for {self.path}"
+                raise TimeoutError(msg)
+            time.sleep(self.poll_interval)
+
+    def release(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+    def _remove_if_stale(self) -> None:
+        try:
+            age = time.time() - self.path.stat().st_mtime
+        except FileNotFoundError:
+            return
+        if age > self.stale_after:
+            self.path.unlink(missing_ok=True)
+
+    def __enter__(self) -> Self:
+        self.acquire()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.release()
@@ -22,9 +22,13 @@ from .data_models import (
 )
 from .helpers import (
     add_vaccine_batch,
+    feature_flags_state_hash,
+    flipper_helper,
+    log_in_as,
     log_in_as_medical_secretary,
     log_in_as_nurse,
     log_in_as_prescriber,
+    log_in_storage_states,
     schedule_mmr_session_and_get_consent_url,
     schedule_session_and_get_consent_url,
     set_feature_flags,
@@ -34,6 +38,7 @@ from .helpers import (
 from .imms_api import authenticate_api
 from .onboarding import (
     national_reporting_onboarding,
+    onboarded_tenant,
     point_of_care_onboarding,
     programmes_enabled,
     year_groups,
@@ -57,9 +62,13 @@ __all__ = [
     "browser_type",
     "children",
     "delete_teams_after_tests",
+    "feature_flags_state_hash",
+    "flipper_helper",
+    "log_in_as",
     "log_in_as_medical_secretary",
     "log_in_as_nurse",
     "log_in_as_prescriber",
+    "log_in_storage_states",
     "national_reporting_file_generator",
     "national_reporting_healthcare_assistant",
     "national_reporting_medical_secretary",
@@ -69,6 +78,7 @@ __all__ = [
     "national_reporting_prescriber",
     "national_reporting_superuser",
     "national_reporting_team",
+    "onboarded_tenant",
     "point_of_care_clinics",
     "point_of_care_file_generator",
     "point_of_care_healthcare_assistant",
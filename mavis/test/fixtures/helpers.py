@@ -1,17 +1,23 @@
-import os
+import logging
 import re
 
 import pytest
+from playwright.sync_api import StorageState
 
 from mavis.test.constants import ConsentOption, Programme, Vaccine
 from mavis.test.data import ClassFileMapping, VaccsFileMapping
-from mavis.test.data_models import School
+from mavis.test.data_models import School, Team, User
+from mavis.test.form_seeding import FORMS, FormSeeder, SeedingError, seeding_mode
+from mavis.test.helpers.flipper_helper import (
+    FlipperHelper,
+    feature_flags_enabled,
+    hash_feature_flag_state,
+)
 from mavis.test.pages import (
     AddBatchPage,
     ChildRecordPage,
     ChildrenSearchPage,
     DashboardPage,
-    FlipperPage,
     ImportRecordsWizardPage,
     ImportsPage,
     LogInPage,
@@ -23,25 +29,44 @@ from mavis.test.pages import (
 from mavis.test.pages.utils import schedule_school_session_if_needed
 from mavis.test.utils import get_offset_date
 
+logger = logging.getLogger(__name__)
 
-@pytest.fixture
-def set_feature_flags(page):
-    set_check_feature_flags = os.getenv("SET_FEATURE_FLAGS", "false").lower() == "true"
 
-    if set_check_feature_flags:
-        FlipperPage(page).navigate()
-        FlipperPage(page).set_feature_flags()
+@pytest.fixture(scope="session")
+def flipper_helper() -> FlipperHelper:
+    return FlipperHelper()
+
+
+@pytest.fixture(scope="session")
+def feature_flags_state_hash(flipper_helper) -> str | None:
+    if not feature_flags_enabled():
+        return None
+    return flipper_helper.synchronise_feature_flags()
+
 
+@pytest.fixture
+def set_feature_flags(flipper_helper, feature_flags_state_hash):
     yield
 
-    if set_check_feature_flags:
-        FlipperPage(page).navigate()
-        FlipperPage(page).set_feature_flags(check_only=True)
+    if feature_flags_state_hash is not None:
+        state = flipper_helper.get_feature_flags()
+        if hash_feature_flag_state(state) != feature_flags_state_hash:
+            flipper_helper.check_feature_flags(
+                state, flipper_helper.get_expected_feature_flags(state)
+            )
 
 
 @pytest.fixture
-def add_vaccine_batch(page):
+def add_vaccine_batch(page, point_of_care_team):
     def wrapper(vaccine: Vaccine, batch_name: str = "ABC123"):
+        if seeding_mode() == FORMS:
+            try:
+                return FormSeeder(page).add_vaccine_batch(
+                    point_of_care_team, vaccine, batch_name
+                )
+            except SeedingError:
+                logger.warning("Adding batch through the UI", exc_info=True)
+
         VaccinesPage(page).navigate()
         VaccinesPage(page).click_add_batch(vaccine)
         AddBatchPage(page).fill_name(batch_name)
@@ -94,35 +119,49 @@ def schedule_mmr_session_and_get_consent_url(
     return wrapper
 
 
+@pytest.fixture(scope="session")
+def log_in_storage_states() -> dict[tuple[str, str], StorageState]:
+    # cookies of logged in users per (username, workgroup), for this worker only
+    return {}
+
+
+@pytest.fixture
+def log_in_as(request, log_in_storage_states, page):
+    def wrapper(user: User, team: Team):
+        # login_journey tests go through the log in UI every time
+        if request.node.get_closest_marker("login_journey"):
+            LogInPage(page).navigate()
+            LogInPage(page).log_in_and_choose_team_if_necessary(user, team)
+        else:
+            LogInPage(page).log_in_reusing_storage_state(
+                user, team, log_in_storage_states
+            )
+
+    return wrapper
+
+
 @pytest.fixture
 def log_in_as_medical_secretary(
     set_feature_flags,
     point_of_care_medical_secretary,
     point_of_care_team,
-    page,
+    log_in_as,
 ):
-    LogInPage(page).navigate()
-    LogInPage(page).log_in_and_choose_team_if_necessary(
-        point_of_care_medical_secretary, point_of_care_team
-    )
+    log_in_as(point_of_care_medical_secretary, point_of_care_team)
 
 
 @pytest.fixture
-def log_in_as_nurse(set_feature_flags, point_of_care_nurse, point_of_care_team, page):
-    LogInPage(page).navigate()
-    LogInPage(page).log_in_and_choose_team_if_necessary(
-        point_of_care_nurse, point_of_care_team
-    )
+def log_in_as_nurse(
+    set_feature_flags, point_of_care_nurse, point_of_care_team, log_in_as
+):
+    log_in_as(point_of_care_nurse, point_of_care_team)
 
 
 @pytest.fixture
 def log_in_as_prescriber(
-    set_feature_flags, point_of_care_prescriber, point_of_care_team, page
+    set_feature_flags, point_of_care_prescriber, point_of_care_team, log_in_as
 ):
-    LogInPage(page).navigate()
-    LogInPage(page).log_in_and_choose_team_if_necessary(
-        point_of_care_prescriber, point_of_care_team
-    )
+    log_in_as(point_of_care_prescriber, point_of_care_team)
 
 
 @pytest.fixture
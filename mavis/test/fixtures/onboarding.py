@@ -1,25 +1,22 @@
 import os
 import random
 import time
-import urllib.parse
+from collections.abc import Iterator
 
 import pytest
-import requests
 
 from mavis.test.constants import Programme
 from mavis.test.fixtures.data_models import logger
+from mavis.test.fixtures.team_reset import reset_teams
 from mavis.test.onboarding import (
     NationalReportingOnboarding,
+    OnboardedTenant,
     Onboarding,
     PointOfCareOnboarding,
+    onboarded_tenant_pool,
 )
-
-
-@pytest.fixture(scope="session")
-def year_groups() -> dict[str, int]:
-    return {
-        programme.group: random.choice(programme.year_groups) for programme in Programme
-    }
+from mavis.test.onboarding_pool import onboarding_pool_size
+from mavis.test.testing_api import get_testing_api_client, run_concurrently
 
 
 @pytest.fixture(scope="session")
@@ -28,39 +25,74 @@ def programmes_enabled() -> list[str]:
 
 
 @pytest.fixture(scope="session")
-def point_of_care_onboarding(
-    base_url,
-    year_groups,
-    programmes_enabled,
-) -> PointOfCareOnboarding:
-    onboarding_data = PointOfCareOnboarding.get_onboarding_data_for_tests(
-        base_url=base_url,
-        year_groups=year_groups,
-        programmes=programmes_enabled,
+def onboarded_tenant(base_url, programmes_enabled) -> Iterator[OnboardedTenant]:
+    if not onboarding_pool_size():
+        yield _onboard_tenant(base_url, programmes_enabled)
+        return
+
+    pool = onboarded_tenant_pool(base_url, programmes_enabled)
+    lease = pool.lease(
+        provision=lambda: _onboard_tenant(base_url, programmes_enabled),
+        reset=lambda tenant: reset_teams(
+            base_url, tenant.point_of_care.team, tenant.national_reporting.team
+        ),
     )
-    return _create_onboarding_with_retry(base_url, onboarding_data)
+    yield lease.value
+    pool.release(lease)
+
+
+@pytest.fixture(scope="session")
+def year_groups(onboarded_tenant) -> dict[str, int]:
+    # schools are chosen for these year groups during onboarding
+    return onboarded_tenant.year_groups
+
+
+@pytest.fixture(scope="session")
+def point_of_care_onboarding(onboarded_tenant) -> PointOfCareOnboarding:
+    return onboarded_tenant.point_of_care
 
 
 @pytest.fixture(scope="session")
-def national_reporting_onboarding(
-    base_url,
-    programmes_enabled,
-) -> NationalReportingOnboarding:
-    onboarding_data = NationalReportingOnboarding.get_onboarding_data_for_tests(
-        programmes=programmes_enabled,
+def national_reporting_onboarding(onboarded_tenant) -> NationalReportingOnboarding:
+    return onboarded_tenant.national_reporting
+
+
+def _onboard_tenant(base_url: str, programmes: list[str]) -> OnboardedTenant:
+    year_groups = {
+        programme.group: random.choice(programme.year_groups) for programme in Programme
+    }
+
+    def onboard_point_of_care() -> PointOfCareOnboarding:
+        onboarding_data = PointOfCareOnboarding.get_onboarding_data_for_tests(
+            base_url=base_url,
+            year_groups=year_groups,
+            programmes=programmes,
+        )
+        return _create_onboarding_with_retry(base_url, onboarding_data)
+
+    def onboard_national_reporting() -> NationalReportingOnboarding:
+        onboarding_data = NationalReportingOnboarding.get_onboarding_data_for_tests(
+            programmes=programmes,
+        )
+        return _create_onboarding_with_retry(base_url, onboarding_data)
+
+    point_of_care, national_reporting = run_concurrently(
+        onboard_point_of_care, onboard_national_reporting
+    )
+    return OnboardedTenant(
+        year_groups=year_groups,
+        point_of_care=point_of_care,
+        national_reporting=national_reporting,
     )
-    return _create_onboarding_with_retry(base_url, onboarding_data)
 
 
 def _create_onboarding_with_retry[T: Onboarding](
     base_url: str, onboarding_data: T, max_attempts: int = 3
 ) -> T:
-    onboarding_url = urllib.parse.urljoin(base_url, "api/testing/onboard")
+    client = get_testing_api_client(base_url)
 
     for attempt in range(1, max_attempts + 1):
-        response = requests.post(
-            onboarding_url, json=onboarding_data.to_dict(), timeout=30
-        )
+        response = client.post("api/testing/onboard", json=onboarding_data.to_dict())
         if response.ok:
             return onboarding_data
 
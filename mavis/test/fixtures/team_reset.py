@@ -1,10 +1,17 @@
+import functools
 import logging
-import urllib.parse
+import time
 
 import pytest
-import requests
 
 from mavis.test.data_models import Team
+from mavis.test.form_seeding import seeded_records
+from mavis.test.onboarding_pool import onboarding_pool_size
+from mavis.test.testing_api import (
+    TestingApiClient,
+    get_testing_api_client,
+    run_concurrently,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -13,19 +20,36 @@ logger = logging.getLogger(__name__)
 def delete_teams_after_tests(base_url, point_of_care_team, national_reporting_team):
     yield
 
-    _delete_team(base_url, point_of_care_team)
-    _delete_team(base_url, national_reporting_team)
+    if onboarding_pool_size():
+        return  # pooled teams are reset and leased again instead
+
+    delete_teams(base_url, point_of_care_team, national_reporting_team)
 
 
 @pytest.fixture(scope="module", autouse=True)
 def reset_before_each_module(
     base_url, point_of_care_team, national_reporting_team
 ) -> None:
-    _delete_team(base_url, point_of_care_team, keep_itself=True)
-    _delete_team_locations(base_url, point_of_care_team, keep_base_locations=True)
+    start = time.perf_counter()
+    reset_teams(base_url, point_of_care_team, national_reporting_team)
+    seeded_records.clear()
+    logger.info("Reset teams in %.0fms", (time.perf_counter() - start) * 1000)
+
+
+def delete_teams(base_url: str, *teams: Team) -> None:
+    client = get_testing_api_client(base_url)
+    run_concurrently(*(functools.partial(_delete_team, client, team) for team in teams))
+
+
+def reset_teams(base_url: str, *teams: Team) -> None:
+    client = get_testing_api_client(base_url)
 
-    _delete_team(base_url, national_reporting_team, keep_itself=True)
-    _delete_team_locations(base_url, national_reporting_team, keep_base_locations=True)
+    # a team's data must go before its locations, but teams are independent
+    def reset_team(team: Team) -> None:
+        _delete_team(client, team, keep_itself=True)
+        _delete_team_locations(client, team, keep_base_locations=True)
+
+    run_concurrently(*(functools.partial(reset_team, team) for team in teams))
 
 
 def _check_response_status(response) -> None:
@@ -34,19 +58,19 @@ def _check_response_status(response) -> None:
     response.raise_for_status()
 
 
-def _delete_team(base_url: str, team: Team, *, keep_itself: bool = False) -> None:
-    url = urllib.parse.urljoin(base_url, f"api/testing/teams/{team.workgroup}")
+def _delete_team(
+    client: TestingApiClient, team: Team, *, keep_itself: bool = False
+) -> None:
     params = {"keep_itself": "true"} if keep_itself else {}
-    response = requests.delete(url, params=params, timeout=30)
+    response = client.delete(f"api/testing/teams/{team.workgroup}", params=params)
     _check_response_status(response)
 
 
 def _delete_team_locations(
-    base_url: str, team: Team, *, keep_base_locations: bool = False
+    client: TestingApiClient, team: Team, *, keep_base_locations: bool = False
 ) -> None:
-    url = urllib.parse.urljoin(
-        base_url, f"api/testing/teams/{team.workgroup}/locations"
-    )
     params = {"keep_base_locations": "true"} if keep_base_locations else {}
-    response = requests.delete(url, params=params, timeout=30)
+    response = client.delete(
+        f"api/testing/teams/{team.workgroup}/locations", params=params
+    )
     _check_response_status(response)
@@ -0,0 +1,486 @@
+import logging
+import os
+import time
+import urllib.parse
+from html.parser import HTMLParser
+
+from attr import dataclass, field
+from playwright.sync_api import APIResponse, Page
+
+from mavis.test.constants import Programme, Vaccine
+from mavis.test.data_models import Location, School, Team
+from mavis.test.utils import (
+    get_day_month_year_from_compact_date,
+    get_formatted_date_for_session_dates,
+    get_formatted_date_without_year,
+    get_offset_date,
+    get_offset_date_compact_format,
+    normalize_whitespace,
+)
+
+logger = logging.getLogger(__name__)
+
+FORMS = "forms"
+UI = "ui"
+
+
+def seeding_mode() -> str:
+    """SEEDING_MODE: "forms" to post setup forms directly, "ui" to click."""
+    return (os.getenv("SEEDING_MODE") or UI).lower()
+
+
+class SeedingError(Exception):
+    """A page did not have the link, form or field that seeding expected."""
+
+
+@dataclass
+class FormField:
+    tag: str
+    name: str
+    type: str
+    value: str
+    id: str | None = None
+    checked: bool = False
+    text: str = ""
+    options: list[tuple[str, str]] = field(factory=list)
+
+
+@dataclass
+class HtmlForm:
+    action: str
+    method: str
+    fields: list[FormField] = field(factory=list)
+    buttons: list[FormField] = field(factory=list)
+    labels: dict[str, str] = field(factory=dict)
+
+    def has_button(self, text: str) -> bool:
+        return any(button.text == text for button in self.buttons)
+
+    def field_by_label(self, label: str) -> FormField:
+        # like get_by_role(...).last, date fields repeat when adding dates
+        matches = [it for it in self.fields if self.labels.get(it.id or "") == label]
+        if not matches:
+            msg = f"No field labelled {label!r} in form {self.action}"
+            raise SeedingError(msg)
+        return matches[-1]
+
+    def fill(self, label: str, value: str) -> None:
+        self.field_by_label(label).value = value
+
+    def fill_date(self, compact_date: str) -> None:
+        day, month, year = get_day_month_year_from_compact_date(compact_date)
+        self.fill("Day", str(day))
+        self.fill("Month", str(month))
+        self.fill("Year", str(year))
+
+    def check(self, label: str) -> None:
+        self._check(self.field_by_label(label))
+
+    def check_value(self, value: str) -> None:
+        for form_field in self.fields:
+            if form_field.type == "checkbox" and form_field.value == value:
+                self._check(form_field)
+                return
+        msg = f"No checkbox with value {value!r} in form {self.action}"
+        raise SeedingError(msg)
+
+    def select_option(self, text: str) -> None:
+        for form_field in self.fields:
+            for value, option_text in form_field.options:
+                if option_text.split("\n", 1)[0].strip() == text:
+                    form_field.value = value
+                    return
+        msg = f"No option {text!r} in form {self.action}"
+        raise SeedingError(msg)
+
+    def _check(self, checked_field: FormField) -> None:
+        if checked_field.type == "radio":
+            for form_field in self.fields:
+                if form_field.name == checked_field.name:
+                    form_field.checked = False
+        checked_field.checked = True
+
+    def data(self, button_text: str) -> list[tuple[str, str]]:
+        """The fields submitted by clicking the button, in document order."""
+        button = next(it for it in self.buttons if it.text == button_text)
+        data = [
+            (form_field.name, form_field.value or "on")
+            if form_field.type in {"checkbox", "radio"}
+            else (form_field.name, form_field.value)
+            for form_field in self.fields
+            if form_field.name
+            and (form_field.checked or form_field.type not in {"checkbox", "radio"})
+        ]
+        if button.name:
+            data.append((button.name, button.value))
+        return data
+
+
+@dataclass
+class HtmlDocument:
+    url: str
+    forms: list[HtmlForm] = field(factory=list)
+    links: list[tuple[str, str]] = field(factory=list)
+    cards: list[tuple[str, str | None]] = field(factory=list)
+    text: str = ""
+    h1: str = ""
+
+    def form_with_button(self, text: str) -> HtmlForm:
+        for form in self.forms:
+            if form.has_button(text):
+                return form
+        msg = f"No form with a {text!r} button on {self.url}"
+        raise SeedingError(msg)
+
+    def link_href(self, name: str) -> str:
+        for link_name, href in self.links:
+            if link_name == name:
+                return urllib.parse.urljoin(self.url, href)
+        msg = f"No link {name!r} on {self.url}"
+        raise SeedingError(msg)
+
+
+class _DocumentParser(HTMLParser):
+    # collects forms with their labelled fields, links by accessible name and
+    # clickable cards with their text and first link, which is all that the
+    # seeding below reads from a page
+    def __init__(self, url: str) -> None:
+        super().__init__()
+        self.document = HtmlDocument(url=url)
+        self._form: HtmlForm | None = None
+        self._label_for: str | None = None
+        self._text_target: FormField | None = None
+        self._link: list[str] | None = None
+        self._link_href = ""
+        self._link_label: str | None = None
+        self._card_depth = 0
+        self._card_text: list[str] = []
+        self._card_href: str | None = None
+        self._option: list[str] | None = None
+        self._option_value: str | None = None
+        self._select: FormField | None = None
+        self._text: list[str] = []
+        self._page_text: list[str] = []
+        self._h1: list[str] | None = None
+
+    def close(self) -> None:
+        super().close()
+        self.document.text = normalize_whitespace("".join(self._page_text))
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        attributes = {name: value or "" for name, value in attrs}
+        self._start_card(tag, attributes)
+
+        if tag == "h1":
+            self._h1 = []
+        elif tag == "a":
+            self._link = []
+            self._link_href = attributes.get("href", "")
+            self._link_label = attributes.get("aria-label")
+        elif tag == "form":
+            self._form = HtmlForm(
+                action=attributes.get("action", ""),
+                method=attributes.get("method", "get").lower(),
+            )
+            self.document.forms.append(self._form)
+        elif tag == "label":
+            self._label_for = attributes.get("for")
+            self._text = []
+        elif tag == "option" and self._select is not None:
+            self._option = []
+            self._option_value = attributes.get("value")
+            if "selected" in attributes:
+                self._select.value = self._option_value or ""
+        elif self._form is not None:
+            self._start_form_field(self._form, tag, attributes)
+
+    def _start_card(self, tag: str, attributes: dict[str, str]) -> None:
+        if self._card_depth:
+            if tag == "div":
+                self._card_depth += 1
+            if tag == "a" and self._card_href is None:
+                self._card_href = attributes.get("href")
+        elif (
+            tag == "div"
+            and "nhsuk-card--clickable" in attributes.get("class", "").split()
+        ):
+            self._card_depth = 1
+            self._card_text = []
+            self._card_href = None
+
+    def _start_form_field(
+        self, form: HtmlForm, tag: str, attributes: dict[str, str]
+    ) -> None:
+        if tag not in {"input", "button", "select", "textarea"}:
+            return
+
+        default_type = {"input": "text", "button": "submit"}.get(tag, tag)
+        form_field = FormField(
+            tag=tag,
+            name=attributes.get("name", ""),
+            type=attributes.get("type", default_type),
+            value=attributes.get("value", ""),
+            id=attributes.get("id"),
+            checked="checked" in attributes,
+            text=attributes.get("value", "") if tag == "input" else "",
+        )
+
+        if form_field.type == "submit":
+            form.buttons.append(form_field)
+        else:
+            form.fields.append(form_field)
+
+        if tag == "select":
+            self._select = form_field
+        elif tag in {"button", "textarea"}:
+            self._text_target = form_field
+
+    def handle_data(self, data: str) -> None:
+        self._page_text.append(data)
+        if self._h1 is not None:
+            self._h1.append(data)
+        if self._card_depth:
+            self._card_text.append(data)
+        if self._link is not None:
+            self._link.append(data)
+        if self._label_for is not None:
+            self._text.append(data)
+        if self._text_target is not None:
+            self._text_target.text += data
+        if self._option is not None:
+            self._option.append(data)
+
+    def handle_endtag(self, tag: str) -> None:  # noqa: C901
+        if self._card_depth and tag == "div":
+            self._card_depth -= 1
+            if not self._card_depth:
+                self.document.cards.append(("".join(self._card_text), self._card_href))
+
+        if tag == "h1" and self._h1 is not None:
+            self.document.h1 = normalize_whitespace("".join(self._h1)).strip()
+            self._h1 = None
+        elif tag == "a" and self._link is not None:
+            name = self._link_label or normalize_whitespace("".join(self._link))
+            self.document.links.append((name.strip(), self._link_href))
+            self._link = None
+        elif tag == "form":
+            self._form = None
+        elif tag == "label":
+            if self._form is not None and self._label_for:
+                text = normalize_whitespace("".join(self._text)).strip()
+                self._form.labels[self._label_for] = text
+            self._label_for = None
+        elif tag in {"button", "textarea"} and self._text_target is not None:
+            text = self._text_target.text
+            if tag == "button":
+                self._text_target.text = normalize_whitespace(text).strip()
+            else:
+                self._text_target.value = text
+            self._text_target = None
+        elif tag == "option" and self._option is not None and self._select:
+            text = "".join(self._option).strip()
+            value = text if self._option_value is None else self._option_value
+            self._select.options.append((value, text))
+            self._option = None
+        elif tag == "select":
+            self._select = None
+
+
+type SessionKey = tuple[str, tuple[str, ...], tuple[int, ...], int]
+
+
+@dataclass
+class SeededRecords:
+    """Setup data this worker has created or found since the last team reset."""
+
+    # by team workgroup, vaccine and batch name
+    batches: set[tuple[str, Vaccine, str]] = field(factory=set)
+    # session URLs, which are checked when used as tests can edit sessions
+    sessions: dict[SessionKey, str] = field(factory=dict)
+
+    @staticmethod
+    def session_key(
+        location: Location,
+        programmes: list[Programme],
+        year_groups: list[int],
+        date_offset: int,
+    ) -> SessionKey:
+        return (
+            str(location),
+            tuple(sorted(programmes)),
+            tuple(sorted(year_groups)),
+            date_offset,
+        )
+
+    def clear(self) -> None:
+        self.batches.clear()
+        self.sessions.clear()
+
+
+seeded_records = SeededRecords()
+
+
+class FormSeeder:
+    """Creates setup data by posting the app's own forms, without rendering.
+
+    Pages are fetched with the browser context's request API, so requests
+    carry the logged in user's cookies, and forms are submitted with their
+    authenticity token and fields found by label, as a user would fill them.
+    """
+
+    def __init__(self, page: Page) -> None:
+        self.page = page
+        self.request = page.context.request
+
+    def get(self, url: str) -> HtmlDocument:
+        return self._parse(self.request.get(url))
+
+    def submit(
+        self, document: HtmlDocument, form: HtmlForm, button_text: str
+    ) -> HtmlDocument:
+        action = urllib.parse.urljoin(document.url, form.action or document.url)
+        data = urllib.parse.urlencode(form.data(button_text))
+        if form.method == "get":
+            return self._parse(self.request.get(f"{action}?{data}"))
+
+        origin = urllib.parse.urlsplit(document.url)
+        return self._parse(
+            self.request.post(
+                action,
+                data=data,
+                headers={
+                    "Content-Type": "application/x-www-form-urlencoded",
+                    "Origin": f"{origin.scheme}://{origin.netloc}",
+                },
+            )
+        )
+
+    def _parse(self, response: APIResponse) -> HtmlDocument:
+        if not response.ok:
+            msg = f"{response.status} {response.status_text} from {response.url}"
+            raise SeedingError(msg)
+        parser = _DocumentParser(response.url)
+        parser.feed(response.text())
+        parser.close()
+        return parser.document
+
+    def add_vaccine_batch(self, team: Team, vaccine: Vaccine, batch_name: str) -> str:
+        key = (team.workgroup, vaccine, batch_name)
+        if key in seeded_records.batches:
+            return batch_name
+
+        start = time.perf_counter()
+        vaccines = self.get("/vaccines")
+        document = self.get(vaccines.link_href(f"Add a new {vaccine} batch"))
+
+        form = document.form_with_button("Add batch")
+        form.fill("Batch", batch_name)
+        form.fill_date(get_offset_date_compact_format(14))
+        result = self.submit(document, form, "Add batch")
+
+        # as AddBatchPage.verify_batch_added, after the redirect to /vaccines
+        if not (
+            urllib.parse.urlsplit(result.url).path.endswith("/vaccines")
+            and f"Batch {batch_name} added" in result.text
+        ):
+            msg = f"Batch {batch_name} not added, ended on {result.url}"
+            raise SeedingError(msg)
+
+        seeded_records.batches.add(key)
+        logger.info(
+            "Seeded %s batch %s in %.0fms",
+            vaccine,
+            batch_name,
+            (time.perf_counter() - start) * 1000,
+        )
+        return batch_name
+
+    def find_school_session(
+        self,
+        school: School,
+        programmes: list[Programme],
+        year_groups: list[int],
+        date_offset: int,
+    ) -> str | None:
+        """The URL of a matching session, as SessionsSearchPage would find."""
+        sessions = self.get("/sessions")
+        form = sessions.form_with_button("Search")
+        search_field = next(it for it in form.fields if it.type == "search")
+        search_field.value = str(school)
+        results = self.submit(sessions, form, "Search")
+
+        session_date = get_formatted_date_without_year(get_offset_date(date_offset))
+        for card_text, href in results.cards:
+            if (
+                href is not None
+                and all(str(programme) in card_text for programme in programmes)
+                and session_date in card_text
+                and all(str(year_group) in card_text for year_group in year_groups)
+            ):
+                return urllib.parse.urljoin(results.url, href)
+        return None
+
+    def schedule_school_session(
+        self,
+        school: School,
+        programmes: list[Programme],
+        year_groups: list[int],
+        date_offset: int,
+    ) -> str:
+        """Schedule a session like AddSessionWizardPage, returning its URL."""
+        start = time.perf_counter()
+        sessions = self.get("/sessions")
+        document = self.get(sessions.link_href("Add a new session"))
+
+        form = document.form_with_button("Continue")
+        form.check("School session")
+        document = self.submit(document, form, "Continue")
+
+        form = document.form_with_button("Continue")
+        form.select_option(str(school))
+        document = self.submit(document, form, "Continue")
+
+        form = document.form_with_button("Continue")
+        for programme in programmes:
+            form.check(str(programme))
+        document = self.submit(document, form, "Continue")
+
+        form = document.form_with_button("Continue")
+        for year_group in year_groups:
+            form.check_value(str(year_group))
+        document = self.submit(document, form, "Continue")
+
+        form = document.form_with_button("Continue")
+        form.fill_date(get_offset_date_compact_format(date_offset))
+        document = self.submit(document, form, "Continue")
+
+        if any(form.has_button("Keep session dates") for form in document.forms):
+            form = document.form_with_button("Keep session dates")
+            document = self.submit(document, form, "Keep session dates")
+
+        form = document.form_with_button("Continue")
+        document = self.submit(document, form, "Continue")
+
+        # a step that fails validation is shown again rather than redirecting
+        # to the new session, which is headed with its school and lists dates
+        session_date = get_formatted_date_for_session_dates(
+            get_offset_date(date_offset)
+        )
+        if not (
+            urllib.parse.urlsplit(document.url).path.startswith("/sessions/")
+            and not any(form.has_button("Continue") for form in document.forms)
+            and str(school) in document.h1
+            and session_date in document.text
+        ):
+            msg = (
+                f"Session at {school} on {session_date} not added, "
+                f"ended on {document.url}"
+            )
+            raise SeedingError(msg)
+
+        logger.info(
+            "Seeded session at %s in %.0fms",
+            school,
+            (time.perf_counter() - start) * 1000,
+        )
+        return document.url
@@ -0,0 +1,207 @@
+import hashlib
+import json
+import logging
+import os
+import uuid
+from html.parser import HTMLParser
+from pathlib import Path
+
+import requests
+
+from mavis.test.file_lock import FileLock
+from mavis.test.utils import get_basic_auth_headers
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FEATURE_FLAGS = frozenset({"api", "basic_auth", "dev_tools"})
+DEFAULT_STATE_PATH = Path("working") / "feature_flags"
+
+# identifies this run, so that state verified by one worker is reused by the
+# others but never by a later run
+RUN_ID = os.environ.get("PYTEST_XDIST_TESTRUNUID") or uuid.uuid4().hex
+
+type FeatureFlagState = dict[str, bool]
+
+
+def feature_flags_enabled() -> bool:
+    return os.getenv("SET_FEATURE_FLAGS", "false").lower() == "true"
+
+
+def get_input_feature_flags() -> frozenset[str]:
+    """Flags to enable: the defaults and any ADDITIONAL_FEATURE_FLAGS."""
+    additional_flags = {
+        flag.lower().strip()
+        for flag in os.getenv("ADDITIONAL_FEATURE_FLAGS", "").split(",")
+        if flag.strip()
+    }
+    return DEFAULT_FEATURE_FLAGS | additional_flags
+
+
+def hash_feature_flag_state(state: FeatureFlagState) -> str:
+    return hashlib.sha256(json.dumps(state, sort_keys=True).encode()).hexdigest()
+
+
+class _FeatureListParser(HTMLParser):
+    # each feature on /flipper/features is a link holding its name in a
+    # .text-truncate element and an element labelled "On" or "Off"
+    def __init__(self) -> None:
+        super().__init__()
+        self.state: FeatureFlagState = {}
+        self._in_feature = False
+        self._in_name = False
+        self._name = ""
+        self._enabled = False
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        attributes = dict(attrs)
+        classes = (attributes.get("class") or "").split()
+
+        if tag == "a" and "list-group-item-action" in classes:
+            self._in_feature = True
+            self._name = ""
+            self._enabled = False
+        elif self._in_feature:
+            if "text-truncate" in classes:
+                self._in_name = True
+            if attributes.get("aria-label") == "On":
+                self._enabled = True
+
+    def handle_data(self, data: str) -> None:
+        if self._in_name:
+            self._name += data
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._in_name:
+            self._in_name = False
+        elif tag == "a" and self._in_feature:
+            self._in_feature = False
+            if self._name.strip():
+                self.state[self._name.strip()] = self._enabled
+
+
+class _BooleanFormParser(HTMLParser):
+    # the authenticity token of the enable/disable form on a feature page
+    def __init__(self) -> None:
+        super().__init__()
+        self.authenticity_token: str | None = None
+        self._in_boolean_form = False
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        attributes = dict(attrs)
+        if tag == "form":
+            self._in_boolean_form = (attributes.get("action") or "").endswith(
+                "/boolean"
+            )
+        elif (
+            tag == "input"
+            and self._in_boolean_form
+            and attributes.get("name") == "authenticity_token"
+        ):
+            self.authenticity_token = attributes.get("value")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "form":
+            self._in_boolean_form = False
+
+
+class FlipperHelper:
+    """Reads and sets Flipper feature flags over HTTP, without a browser.
+
+    The flags are set once per run: the first worker to get the lock reads
+    every flag from one page, enables or disables only the flags that differ,
+    reads them again to verify them and records the verified state. Workers
+    that get the lock afterwards find that state and reuse it.
+    """
+
+    def __init__(self, state_path: Path = DEFAULT_STATE_PATH) -> None:
+        self.base_url = str(os.environ.get("BASE_URL")).rstrip("/")
+        self.flipper_url = f"{self.base_url}/flipper"
+        self.input_feature_flags = get_input_feature_flags()
+
+        key = hashlib.sha256(self.base_url.encode()).hexdigest()[:16]
+        self.state_file = state_path / f"{key}.json"
+        self.lock = FileLock(state_path / f"{key}.lock", timeout=300)
+
+        # Flipper UI keeps its CSRF token in the session cookie
+        self.session = requests.Session()
+        self.session.headers.update(get_basic_auth_headers())
+
+    def get_feature_flags(self) -> FeatureFlagState:
+        response = self.session.get(f"{self.flipper_url}/features", timeout=30)
+        response.raise_for_status()
+
+        parser = _FeatureListParser()
+        parser.feed(response.text)
+        return parser.state
+
+    def get_expected_feature_flags(self, state: FeatureFlagState) -> FeatureFlagState:
+        return {name: name in self.input_feature_flags for name in state}
+
+    def set_feature_flag(self, name: str, *, enabled: bool) -> None:
+        feature_url = f"{self.flipper_url}/features/{name}"
+        response = self.session.get(feature_url, timeout=30)
+        response.raise_for_status()
+
+        parser = _BooleanFormParser()
+        parser.feed(response.text)
+
+        response = self.session.post(
+            f"{feature_url}/boolean",
+            data={
+                "authenticity_token": parser.authenticity_token or "",
+                "action": "Enable" if enabled else "Disable",
+            },
+            timeout=30,
+        )
+        response.raise_for_status()
+        logger.info("%s feature flag %s", "Enabled" if enabled else "Disabled", name)
+
+    def synchronise_feature_flags(self) -> str:
+        """Set the feature flags for this run, returning their state hash."""
+        with self.lock:
+            recorded = self._read_recorded_state()
+            if recorded is not None:
+                return hash_feature_flag_state(recorded)
+
+            state = self.get_feature_flags()
+            expected = self.get_expected_feature_flags(state)
+            for name, enabled in expected.items():
+                if state[name] != enabled:
+                    self.set_feature_flag(name, enabled=enabled)
+
+            state = self.get_feature_flags()
+            self.check_feature_flags(state, expected)
+            self._write_recorded_state(state)
+            return hash_feature_flag_state(state)
+
+    def check_feature_flags(
+        self, state: FeatureFlagState, expected: FeatureFlagState
+    ) -> None:
+        mismatched = sorted(
+            name for name, enabled in expected.items() if state.get(name) != enabled
+        )
+        if mismatched:
+            msg = f"Feature flags not as expected: {mismatched}, got {state}"
+            raise AssertionError(msg)
+
+    def _read_recorded_state(self) -> FeatureFlagState | None:
+        try:
+            recorded = json.loads(self.state_file.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if recorded["run"] != RUN_ID or recorded["flags"] != sorted(
+            self.input_feature_flags
+        ):
+            return None
+        return recorded["state"]
+
+    def _write_recorded_state(self, state: FeatureFlagState) -> None:
+        recorded = {
+            "run": RUN_ID,
+            "flags": sorted(self.input_feature_flags),
+            "state": state,
+        }
+        temporary = self.state_file.with_suffix(".tmp")
+        temporary.write_text(json.dumps(recorded, indent=2))
+        temporary.replace(self.state_file)
@@ -1,14 +1,38 @@
+import json
+import logging
+import random
+import statistics
 import time
 import uuid
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import NamedTuple
 
 import dateutil.parser
 import requests
+from attr import dataclass, field
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from mavis.test.constants import DeliverySite, ImmsEndpoints, Vaccine
 from mavis.test.data.file_utils import create_fhir_immunization_payload
 from mavis.test.data_models import Child, School
+from mavis.test.helpers.imms_token_provider import ImmsTokenProvider
+from mavis.test.reload_waits import (
+    BACKOFF_FACTOR,
+    INITIAL_DELAY_SECONDS,
+    JITTER,
+    MAX_DELAY_SECONDS,
+)
+from mavis.test.testing_api import DEFAULT_TIMEOUT_SECONDS, MAX_CONNECTIONS
+
+logger = logging.getLogger(__name__)
+
+RECORD_TIMEOUT_SECONDS = 60
+ABSENT_RECORD_TIMEOUT_SECONDS = 15
+# reads of a batch are spread over this many threads
+POLL_WORKERS = 4
 
 
 class ImmsApiVaccinationRecord(NamedTuple):
@@ -22,18 +46,28 @@ class ImmsApiVaccinationRecord(NamedTuple):
     def from_response(
         cls, response: requests.Response
     ) -> "ImmsApiVaccinationRecord | None":
-        data = response.json()
-        immunization = next(
-            (
-                entry["resource"]
-                for entry in data.get("entry", [])
-                if entry.get("resource", {}).get("resourceType") == "Immunization"
-            ),
-            None,
-        )
-        if immunization is None:
-            return None
+        return next(iter(cls.all_from_response(response)), None)
+
+    @classmethod
+    def all_from_response(
+        cls, response: requests.Response
+    ) -> list["ImmsApiVaccinationRecord"]:
+        return [
+            cls.from_immunization(immunization)
+            for immunization in _immunizations(response)
+        ]
 
+    @classmethod
+    def by_id_from_response(
+        cls, response: requests.Response
+    ) -> dict[str, "ImmsApiVaccinationRecord"]:
+        return {
+            immunization["id"]: cls.from_immunization(immunization)
+            for immunization in _immunizations(response)
+        }
+
+    @classmethod
+    def from_immunization(cls, immunization: dict) -> "ImmsApiVaccinationRecord":
         return cls(
             patient_nhs_number=immunization["patient"]["identifier"]["value"],
             vaccine_code=immunization["vaccineCode"]["coding"][0]["code"],
@@ -64,15 +98,105 @@ class ImmsApiVaccinationRecord(NamedTuple):
         )
 
 
+def _immunizations(response: requests.Response) -> list[dict]:
+    data = response.json()
+    return [
+        entry["resource"]
+        for entry in data.get("entry", [])
+        if entry.get("resource", {}).get("resourceType") == "Immunization"
+    ]
+
+
+class ExpectedImmsApiRecord(NamedTuple):
+    vaccine: Vaccine
+    child: Child
+    record: ImmsApiVaccinationRecord
+    # when known, only the Immunization with this ID can match
+    immunization_id: str | None = None
+
+
+def _describe_record(vaccine: Vaccine, child: Child) -> str:
+    return f"{child.nhs_number} ({vaccine})"
+
+
+def _unique_names(names: Iterable[str]) -> list[str]:
+    # a child can have several records of a vaccine, and each is checked
+    counts: dict[str, int] = {}
+    unique = []
+    for name in names:
+        counts[name] = counts.get(name, 0) + 1
+        unique.append(name if counts[name] == 1 else f"{name} #{counts[name]}")
+    return unique
+
+
+@dataclass
+class ImmsConsistencyStats:
+    """Time until each record checked in this worker matched the IMMS API."""
+
+    latencies: list[float] = field(factory=list)
+    reads: int = 0
+    timeouts: int = 0
+
+    def record(self, latency: float, reads: int, *, consistent: bool) -> None:
+        self.latencies.append(latency)
+        self.reads += reads
+        self.timeouts += not consistent
+
+    def __str__(self) -> str:
+        if not self.latencies:
+            return "no checks"
+        return (
+            f"{len(self.latencies)} records, {self.reads} reads, "
+            f"{self.timeouts} timed out, "
+            f"median {statistics.median(self.latencies):.1f}s, "
+            f"max {max(self.latencies):.1f}s"
+        )
+
+
+imms_consistency_stats = ImmsConsistencyStats()
+
+
 class ImmsApiHelper:
-    def __init__(self, token: str) -> None:
-        self.headers = {
-            "accept": "application/fhir+json",
-            "content-type": "application/x-www-form-urlencoded",
-            "x-correlation-id": str(uuid.uuid4()),
-            "x-request-id": str(uuid.uuid4()),
-            "Authorization": f"Bearer {token}",
-        }
+    """Reads and writes records in the IMMS API over a pooled session.
+
+    Records written by Mavis reach the IMMS API eventually, so checks poll
+    until they hold, backing off exponentially up to a deadline. The time
+    each record took to become consistent is logged and recorded in
+    `imms_consistency_stats`.
+    """
+
+    def __init__(self, token_provider: ImmsTokenProvider) -> None:
+        self.token_provider = token_provider
+        self.session = requests.Session()
+        self.session.headers.update(
+            {
+                "accept": "application/fhir+json",
+                "content-type": "application/x-www-form-urlencoded",
+                "x-correlation-id": str(uuid.uuid4()),
+                "x-request-id": str(uuid.uuid4()),
+            }
+        )
+
+        # only reads are retried, a create may have been applied already
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=MAX_CONNECTIONS,
+            pool_maxsize=MAX_CONNECTIONS,
+            max_retries=retry,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @property
+    def headers(self) -> dict[str, str]:
+        # the token is refreshed while the helper is in use
+        return {"Authorization": f"Bearer {self.token_provider.access_token}"}
 
     def check_record_in_imms_api(
         self,
@@ -82,23 +206,76 @@ class ImmsApiHelper:
         delivery_site: DeliverySite,
         vaccination_time: datetime,
     ) -> None:
-        max_attempts = 20
-        for attempt in range(max_attempts):
-            try:
-                imms_vaccination_record = self._get_imms_api_record_for_child(
-                    vaccine, child
-                )
-                self.check_expected_and_actual_records_match(
+        self.check_records_in_imms_api(
+            [
+                ExpectedImmsApiRecord(
+                    vaccine,
+                    child,
                     ImmsApiVaccinationRecord.from_values(
                         vaccine, child, delivery_site, school, vaccination_time
                     ),
-                    imms_vaccination_record,
                 )
-                break  # Success, exit loop
-            except AssertionError:
-                if attempt == max_attempts - 1:
-                    raise
-                time.sleep(3)
+            ]
+        )
+
+    def check_records_in_imms_api(
+        self,
+        expected_records: Iterable[ExpectedImmsApiRecord],
+        seconds: float = RECORD_TIMEOUT_SECONDS,
+    ) -> dict[str, float]:
+        """Wait until every record matches one of the child's IMMS API records.
+
+        A record with an `immunization_id` must match the Immunization with
+        that ID. Returns the seconds each record took to match, by description,
+        or by ID where it has one.
+        """
+
+        def check(expected: ExpectedImmsApiRecord) -> Callable[[], None]:
+            if expected.immunization_id is None:
+                return lambda: self.check_any_record_matches(
+                    expected.record,
+                    self._get_imms_api_records_for_child(
+                        expected.vaccine, expected.child
+                    ),
+                )
+            return lambda: self.check_expected_and_actual_records_match(
+                expected.record,
+                self._get_imms_api_records_by_id_for_child(
+                    expected.vaccine, expected.child
+                ).get(expected.immunization_id),
+            )
+
+        expected_records = list(expected_records)
+        names = _unique_names(
+            expected.immunization_id
+            or _describe_record(expected.vaccine, expected.child)
+            for expected in expected_records
+        )
+        return self._wait_until_consistent(
+            {
+                name: check(expected)
+                for name, expected in zip(names, expected_records, strict=True)
+            },
+            seconds,
+        )
+
+    def check_any_record_matches(
+        self,
+        expected_record: ImmsApiVaccinationRecord,
+        actual_records: Iterable[ImmsApiVaccinationRecord],
+    ) -> None:
+        msg = "No immunization record found"
+        error = AssertionError(msg)
+        for actual_record in actual_records:
+            try:
+                self.check_expected_and_actual_records_match(
+                    expected_record, actual_record
+                )
+            except AssertionError as mismatch:
+                error = mismatch
+            else:
+                return
+        raise error
 
     def check_expected_and_actual_records_match(
         self,
@@ -161,17 +338,93 @@ class ImmsApiHelper:
         vaccine: Vaccine,
         child: Child,
     ) -> None:
-        max_attempts = 5
-        for attempt in range(max_attempts):
-            imms_vaccination_record = self._get_imms_api_record_for_child(
-                vaccine, child
+        self.check_records_are_not_in_imms_api([(vaccine, child)])
+
+    def check_records_are_not_in_imms_api(
+        self,
+        vaccines_and_children: Iterable[tuple[Vaccine, Child]],
+        seconds: float = ABSENT_RECORD_TIMEOUT_SECONDS,
+    ) -> dict[str, float]:
+        """Wait until none of the children have a record of the vaccine.
+
+        Returns the seconds each record took to disappear, by description.
+        """
+
+        def check(vaccine: Vaccine, child: Child) -> Callable[[], None]:
+            def check_absent() -> None:
+                if self._get_imms_api_record_for_child(vaccine, child) is not None:
+                    msg = f"Immunization record still found for {child.nhs_number}"
+                    raise AssertionError(msg)
+
+            return check_absent
+
+        return self._wait_until_consistent(
+            {
+                _describe_record(vaccine, child): check(vaccine, child)
+                for vaccine, child in vaccines_and_children
+            },
+            seconds,
+        )
+
+    def _wait_until_consistent(
+        self, checks: dict[str, Callable[[], None]], seconds: float
+    ) -> dict[str, float]:
+        # each round runs the checks that have not yet passed on the pool, and
+        # a check that raises AssertionError is tried again in the next round
+        start = time.monotonic()
+        deadline = start + seconds
+        delay = INITIAL_DELAY_SECONDS
+        latencies: dict[str, float] = {}
+        reads = dict.fromkeys(checks, 0)
+        errors: dict[str, AssertionError] = {}
+
+        with ThreadPoolExecutor(
+            max_workers=min(len(checks), POLL_WORKERS) or 1,
+            thread_name_prefix="imms-api",
+        ) as executor:
+            while True:
+                pending = [name for name in checks if name not in latencies]
+                futures = {name: executor.submit(checks[name]) for name in pending}
+                for name, future in futures.items():
+                    reads[name] += 1
+                    try:
+                        future.result()
+                    except AssertionError as error:
+                        errors[name] = error
+                    else:
+                        errors.pop(name, None)
+                        latencies[name] = time.monotonic() - start
+
+                remaining = deadline - time.monotonic()
+                if not errors or remaining <= 0:
+                    break
+
+                jittered = delay * random.uniform(1 - JITTER, 1 + JITTER)
+                time.sleep(min(jittered, remaining))
+                delay = min(delay * BACKOFF_FACTOR, MAX_DELAY_SECONDS)
+
+        for name in checks:
+            consistent = name in latencies
+            latency = latencies.get(name, time.monotonic() - start)
+            imms_consistency_stats.record(latency, reads[name], consistent=consistent)
+            logger.info(
+                "IMMS API record %s %s after %.1fs and %s reads",
+                name,
+                "consistent" if consistent else "not consistent",
+                latency,
+                reads[name],
+            )
+
+        if errors:
+            name, error = next(iter(errors.items()))
+            if len(errors) == 1:
+                raise error
+            msg = (
+                f"{len(errors)} records not consistent within {seconds}s, "
+                f"including {name}: {error}"
             )
-            if imms_vaccination_record is None:
-                break
-            if attempt == max_attempts - 1:
-                msg = f"Immunization record still found for {child.nhs_number}"
-                raise AssertionError(msg)
-            time.sleep(3)
+            raise AssertionError(msg) from error
+        return latencies
 
     def get_raw_api_response_for_child(
         self, vaccine: Vaccine, child: Child
@@ -182,11 +435,11 @@ class ImmsApiHelper:
             "patient.identifier": f"https://fhir.nhs.uk/Id/nhs-number|{child.nhs_number}",
         }
 
-        response = requests.get(
+        response = self.session.get(
             url=ImmsEndpoints.READ.to_url,
             headers=self.headers,
             params=_params,
-            timeout=30,
+            timeout=DEFAULT_TIMEOUT_SECONDS,
         )
         response.raise_for_status()
 
@@ -200,6 +453,52 @@ class ImmsApiHelper:
         response = self.get_raw_api_response_for_child(vaccine, child)
         return ImmsApiVaccinationRecord.from_response(response)
 
+    def _get_imms_api_records_for_child(
+        self,
+        vaccine: Vaccine,
+        child: Child,
+    ) -> list[ImmsApiVaccinationRecord]:
+        response = self.get_raw_api_response_for_child(vaccine, child)
+        return ImmsApiVaccinationRecord.all_from_response(response)
+
+    def _get_imms_api_records_by_id_for_child(
+        self,
+        vaccine: Vaccine,
+        child: Child,
+    ) -> dict[str, ImmsApiVaccinationRecord]:
+        response = self.get_raw_api_response_for_child(vaccine, child)
+        return ImmsApiVaccinationRecord.by_id_from_response(response)
+
+    def post_immunization(self, payload: dict | str) -> str:
+        """POST an Immunization resource, returning the ID it was created with.
+
+        A payload already rendered as JSON is sent as it is. Raises HTTPError
+        if the response does not give the new resource's Location.
+        """
+        # Create headers for POST request
+        create_headers = self.headers.copy()
+        create_headers["content-type"] = "application/fhir+json"
+
+        if isinstance(payload, dict):
+            payload = json.dumps(payload)
+
+        response = self.session.post(
+            url=ImmsEndpoints.CREATE.to_url,
+            headers=create_headers,
+            data=payload.encode(),
+            timeout=DEFAULT_TIMEOUT_SECONDS,
+        )
+        response.raise_for_status()
+
+        # the ID is only given in the Location of the new resource
+        immunization_id = (
+            response.headers.get("Location", "").rstrip("/").rpartition("/")[2]
+        )
+        if not immunization_id:
+            msg = f"No Location for the created immunization from {response.url}"
+            raise requests.HTTPError(msg, response=response)
+        return immunization_id
+
     def create_vaccination_record(
         self,
         vaccine: Vaccine,
@@ -232,17 +531,7 @@ class ImmsApiHelper:
             vaccination_time=vaccination_time,
         )
 
-        # Create headers for POST request
-        create_headers = self.headers.copy()
-        create_headers["content-type"] = "application/fhir+json"
-
-        response = requests.post(
-            url=ImmsEndpoints.CREATE.to_url,
-            headers=create_headers,
-            json=immunization_payload,
-            timeout=30,
-        )
-        response.raise_for_status()
+        self.post_immunization(immunization_payload)
 
         # If creation was successful, verify the record exists in the API
         self.check_record_in_imms_api(
@@ -0,0 +1,202 @@
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+import allure
+import requests
+from attr import dataclass, field
+
+from mavis.test.data.immunization_builder import (
+    ImmunizationSpec,
+    fhir_immunization_builder,
+)
+from mavis.test.helpers.imms_api_helper import (
+    ExpectedImmsApiRecord,
+    ImmsApiHelper,
+    ImmsApiVaccinationRecord,
+)
+from mavis.test.testing_api import MAX_CONNECTIONS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE_PER_SECOND = 10
+
+
+def seed_rate_per_second() -> float:
+    """IMMS_SEED_RATE_PER_SECOND, the most records to create each second."""
+    return float(os.getenv("IMMS_SEED_RATE_PER_SECOND") or DEFAULT_RATE_PER_SECOND)
+
+
+class TokenBucket:
+    """A thread-safe token bucket allowing `rate` acquisitions per second.
+
+    Up to `capacity` acquisitions can happen at once after the bucket has been
+    idle, after which callers wait for the bucket to refill.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take a token, returning the seconds spent waiting for it."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated_at) * self.rate
+            )
+            self.updated_at = now
+            # callers reserve tokens in turn, so the balance can go negative
+            self.tokens -= 1
+            wait = max(-self.tokens / self.rate, 0)
+        time.sleep(wait)
+        return wait
+
+
+@dataclass
+class SeedingStats:
+    """Counts and timings of one bulk seeding run."""
+
+    created: int = 0
+    failed: int = 0
+    throttled_seconds: float = 0
+    create_seconds: float = 0
+    verify_seconds: float = 0
+    latencies: list[float] = field(factory=list)
+
+    @property
+    def throughput(self) -> float:
+        return self.created / self.create_seconds if self.create_seconds else 0
+
+    @property
+    def error_rate(self) -> float:
+        attempted = self.created + self.failed
+        return self.failed / attempted if attempted else 0
+
+    def __str__(self) -> str:
+        mean_latency = (
+            sum(self.latencies) / len(self.latencies) if self.latencies else 0
+        )
+        return (
+            f"{self.created} created, {self.failed} failed "
+            f"({self.error_rate:.1%} errors) in {self.create_seconds:.1f}s, "
+            f"{self.throughput:.1f} records/s, "
+            f"mean POST {mean_latency * 1000:.0f}ms, "
+            f"{self.throttled_seconds:.1f}s throttled, "
+            f"verified in {self.verify_seconds:.1f}s"
+        )
+
+
+class ImmsRecordSeeder:
+    """Creates many records in the IMMS API at once.
+
+    Records are POSTed concurrently, limited to `rate_per_second` by a token
+    bucket shared by the threads, and are then verified together with a single
+    batched check rather than one after another.
+    """
+
+    def __init__(
+        self,
+        imms_api_helper: ImmsApiHelper,
+        rate_per_second: float | None = None,
+        max_workers: int = MAX_CONNECTIONS,
+    ) -> None:
+        self.imms_api_helper = imms_api_helper
+        self.bucket = TokenBucket(rate_per_second or seed_rate_per_second())
+        self.max_workers = max_workers
+
+    def seed(
+        self, specs: Iterable[ImmunizationSpec], *, verify: bool = True
+    ) -> dict[str, ImmunizationSpec]:
+        """Create a record for each spec, returning them by their new IDs.
+
+        Raises RuntimeError if any record could not be created, once the
+        others have been created and verified.
+        """
+        specs = list(specs)
+        stats = SeedingStats()
+        created: dict[str, ImmunizationSpec] = {}
+        errors: list[tuple[ImmunizationSpec, requests.RequestException]] = []
+        lock = threading.Lock()
+
+        def create(spec: ImmunizationSpec) -> None:
+            throttled = self.bucket.acquire()
+            start = time.monotonic()
+            try:
+                immunization_id = self.imms_api_helper.post_immunization(
+                    fhir_immunization_builder.render(spec)
+                )
+            except requests.RequestException as error:
+                with lock:
+                    stats.failed += 1
+                    stats.throttled_seconds += throttled
+                    errors.append((spec, error))
+                return
+            with lock:
+                stats.created += 1
+                stats.throttled_seconds += throttled
+                stats.latencies.append(time.monotonic() - start)
+                created[immunization_id] = spec
+
+        start = time.monotonic()
+        with ThreadPoolExecutor(
+            max_workers=min(len(specs), self.max_workers) or 1,
+            thread_name_prefix="imms-seed",
+        ) as executor:
+            # consume the results so that unexpected errors are raised here
+            list(executor.map(create, specs))
+        stats.create_seconds = time.monotonic() - start
+
+        try:
+            if verify and created:
+                start = time.monotonic()
+                # a child can be given several records of a vaccine, so each
+                # is checked against the Immunization created for it
+                self.imms_api_helper.check_records_in_imms_api(
+                    _expected_record(spec, immunization_id)
+                    for immunization_id, spec in created.items()
+                )
+                stats.verify_seconds = time.monotonic() - start
+        finally:
+            _report_stats(stats)
+
+        if errors:
+            spec, error = errors[0]
+            msg = (
+                f"{len(errors)} of {len(specs)} IMMS API records not created, "
+                f"including {spec.child.nhs_number}: {error}"
+            )
+            raise RuntimeError(msg) from error
+        return created
+
+
+def _expected_record(
+    spec: ImmunizationSpec, immunization_id: str
+) -> ExpectedImmsApiRecord:
+    return ExpectedImmsApiRecord(
+        spec.vaccine,
+        spec.child,
+        ImmsApiVaccinationRecord.from_values(
+            spec.vaccine,
+            spec.child,
+            spec.delivery_site,
+            spec.school,
+            spec.vaccination_time,
+        ),
+        immunization_id,
+    )
+
+
+def _report_stats(stats: SeedingStats) -> None:
+    logger.info("Seeded IMMS API records: %s", stats)
+    allure.attach(
+        str(stats),
+        name="IMMS API seeding",
+        attachment_type=allure.attachment_type.TEXT,
+    )
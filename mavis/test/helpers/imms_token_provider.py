@@ -0,0 +1,188 @@
+import base64
+import functools
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import urllib.parse
+import uuid
+from pathlib import Path
+from typing import NamedTuple
+
+import jwt
+import requests
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
+
+from mavis.test.file_lock import FileLock
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOKEN_CACHE_PATH = Path("working") / "imms_token"
+DEFAULT_EXPIRES_IN_SECONDS = 600
+# refresh this long before the access token expires, or halfway through the
+# token's lifetime if that is sooner
+REFRESH_MARGIN_SECONDS = 60
+ASSERTION_LIFETIME_SECONDS = 300
+
+
+class ImmsApiCredentials(NamedTuple):
+    private_key: RSAPrivateKey
+    api_key: str
+    kid: str
+    token_url: str
+
+
+@functools.cache
+def get_imms_api_credentials() -> ImmsApiCredentials:
+    """IMMS_* credentials, with the private key decoded once per process."""
+    private_key = load_pem_private_key(
+        base64.b64decode(os.environ["IMMS_API_PEM"]), password=None
+    )
+    if not isinstance(private_key, RSAPrivateKey):
+        msg = "IMMS_API_PEM is not an RSA private key"
+        raise TypeError(msg)
+
+    return ImmsApiCredentials(
+        private_key=private_key,
+        api_key=os.environ["IMMS_API_KEY"],
+        kid=os.environ["IMMS_API_KID"],
+        token_url=urllib.parse.urljoin(
+            os.environ["IMMS_BASE_URL"], "oauth2-mock/token"
+        ),
+    )
+
+
+def _get_client_assertion(credentials: ImmsApiCredentials) -> str:
+    headers = {
+        "alg": "RS512",
+        "typ": "JWT",
+        "kid": credentials.kid,
+    }
+    claims = {
+        "sub": credentials.api_key,
+        "iss": credentials.api_key,
+        "jti": str(uuid.uuid4()),
+        "aud": credentials.token_url,
+        "exp": int(time.time()) + ASSERTION_LIFETIME_SECONDS,
+    }
+    return jwt.encode(
+        payload=claims,
+        key=credentials.private_key,
+        algorithm="RS512",
+        headers=headers,
+    )
+
+
+class ImmsTokenProvider:
+    """An IMMS API access token shared by xdist workers and kept fresh.
+
+    The token is cached on disk under a FileLock, so only one worker asks
+    for a new token while the others wait and then read it. Each process
+    refreshes the token in the background shortly before it expires, and
+    `access_token` refreshes it in the foreground if that has not happened.
+    """
+
+    def __init__(
+        self,
+        cache_path: Path = DEFAULT_TOKEN_CACHE_PATH,
+        refresh_margin: float = REFRESH_MARGIN_SECONDS,
+    ) -> None:
+        self.credentials = get_imms_api_credentials()
+        self.refresh_margin = refresh_margin
+
+        key = f"{self.credentials.token_url}|{self.credentials.api_key}"
+        name = hashlib.sha256(key.encode()).hexdigest()[:16]
+        self.cache_file = cache_path / f"{name}.json"
+        self.lock = FileLock(cache_path / f"{name}.lock")
+
+        self._token: str | None = None
+        self._refresh_at = 0.0
+        self._thread_lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+
+    @property
+    def access_token(self) -> str:
+        with self._thread_lock:
+            if self._token is None or time.time() >= self._refresh_at:
+                self._refresh()
+            return self._token
+
+    def stop(self) -> None:
+        with self._thread_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _get_refresh_at(self, cached: dict) -> float:
+        expires_in = cached.get("expires_in", DEFAULT_EXPIRES_IN_SECONDS)
+        # a token that lives no longer than the margin would never be fresh
+        return cached["expires_at"] - min(self.refresh_margin, expires_in / 2)
+
+    def _refresh(self) -> None:
+        with self.lock:
+            cached = self._read_cache()
+            if cached is None:
+                cached = self._request_token()
+                self._write_cache(cached)
+        self._token = cached["access_token"]
+        self._refresh_at = self._get_refresh_at(cached)
+        self._schedule_refresh()
+
+    def _schedule_refresh(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        delay = max(self._refresh_at - time.time(), 0)
+        self._timer = threading.Timer(delay, self._refresh_in_background)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _refresh_in_background(self) -> None:
+        try:
+            with self._thread_lock:
+                self._refresh()
+        except (requests.RequestException, OSError, ValueError, KeyError):
+            # access_token will try again when it is next used
+            logger.warning("Failed to refresh IMMS API token", exc_info=True)
+
+    def _request_token(self) -> dict:
+        response = requests.post(
+            url=self.credentials.token_url,
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            data={
+                "grant_type": "client_credentials",
+                "client_assertion_type": "urn:ietf:params:oauth:client-assertion-type:jwt-bearer",  # noqa: E501
+                "client_assertion": _get_client_assertion(self.credentials),
+            },
+            timeout=30,
+        )
+
+        if not response.ok:
+            logger.warning(response.content)
+        response.raise_for_status()
+
+        token = response.json()
+        expires_in = float(token.get("expires_in") or DEFAULT_EXPIRES_IN_SECONDS)
+        logger.info("Requested IMMS API token expiring in %.0fs", expires_in)
+        return {
+            "access_token": token["access_token"],
+            "expires_at": time.time() + expires_in,
+            "expires_in": expires_in,
+        }
+
+    def _read_cache(self) -> dict | None:
+        try:
+            cached = json.loads(self.cache_file.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return cached if time.time() < self._get_refresh_at(cached) else None
+
+    def _write_cache(self, cached: dict) -> None:
+        temporary = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+        # the token is a credential, so keep it readable by this user only
+        fd = os.open(temporary, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as file:
+            json.dump(cached, file)
+        temporary.replace(self.cache_file)
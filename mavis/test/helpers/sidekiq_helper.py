@@ -1,9 +1,117 @@
-import base64
+import logging
 import os
+import random
+import re
 import time
+import urllib.parse
+from collections.abc import Iterable
+from html.parser import HTMLParser
 from typing import Any
 
+import allure
 import requests
+from attr import dataclass, field
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from mavis.test.reload_waits import (
+    BACKOFF_FACTOR,
+    INITIAL_DELAY_SECONDS,
+    JITTER,
+    MAX_DELAY_SECONDS,
+)
+from mavis.test.testing_api import MAX_CONNECTIONS
+from mavis.test.utils import get_basic_auth_headers
+
+logger = logging.getLogger(__name__)
+
+JOB_ID_PATTERN = re.compile(r"\b[0-9a-f]{24}\b")
+QUEUE_PATH_PATTERN = re.compile(r"(?:^|/)(queues/[^/]+)$")
+# Sidekiq processes report their busy jobs with every heartbeat, every 10s,
+# so a job that has not been seen in this long has not been running for it
+HEARTBEAT_GRACE_SECONDS = 15
+
+
+def _job_token(name: str) -> str:
+    # "enqueue_vaccinations_search_in_nhs_job" and the job's class name
+    # "EnqueueVaccinationsSearchInNHSJob" have the same token
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+class _TableRowParser(HTMLParser):
+    # the text and attribute values of each table row, which is where the
+    # Sidekiq web UI shows a job's class and (sometimes only in a form) its jid
+    def __init__(self) -> None:
+        super().__init__()
+        self.rows: list[str] = []
+        self.links: list[str] = []
+        self._row: list[str] | None = None
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag == "tr":
+            self._row = []
+        if tag == "a":
+            self.links.extend(
+                value for name, value in attrs if name == "href" and value
+            )
+        if self._row is not None:
+            self._row.extend(value for _, value in attrs if value)
+
+    def handle_data(self, data: str) -> None:
+        if self._row is not None:
+            self._row.append(data)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "tr" and self._row is not None:
+            self.rows.append(" ".join(self._row))
+            self._row = None
+
+
+def _matching_rows(rows: list[str], tokens: list[str]) -> list[str]:
+    return [row for row in rows if any(it in _job_token(row) for it in tokens)]
+
+
+def _report_blocked_time(name: str, timings: str) -> None:
+    logger.info("%s: %s", name, timings.replace("\n", ", "))
+    allure.attach(timings, name=name, attachment_type=allure.attachment_type.TEXT)
+
+
+@dataclass
+class RecurringJobRun:
+    """A recurring job enqueued by this helper, and the jobs seen for it."""
+
+    name: str
+    enqueued_at: float
+    processed_before: int | None
+    existing_job_ids: set[str]
+    job_ids: set[str] = field(factory=set)
+    seen: bool = False
+    finished_at: float | None = None
+
+    @property
+    def token(self) -> str:
+        return _job_token(self.name)
+
+    @property
+    def blocked_seconds(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.enqueued_at
+
+
+@dataclass
+class SidekiqSnapshot:
+    """Rows of the queues, busy, retries and dead pages at one moment."""
+
+    running: list[str]
+    failed: list[str]
+    processed: int | None
+
+    @staticmethod
+    def job_rows(rows: list[str], token: str) -> list[str]:
+        return [row for row in rows if token in _job_token(row)]
+
+    @staticmethod
+    def job_ids(rows: list[str]) -> set[str]:
+        return {job_id for row in rows for job_id in JOB_ID_PATTERN.findall(row)}
 
 
 class SidekiqHelper:
@@ -11,22 +119,23 @@ class SidekiqHelper:
         self.base_url = str(os.environ.get("BASE_URL")).rstrip("/")
         self.sidekiq_url = f"{self.base_url}/sidekiq"
 
-        # Set up authentication similar to browser_context_args fixture
-        basic_auth_token = os.environ.get("BASIC_AUTH_TOKEN")
-        basic_auth_username = os.environ.get("BASIC_AUTH_USERNAME")
-        basic_auth_password = os.environ.get("BASIC_AUTH_PASSWORD")
-
-        if basic_auth_token:
-            self.auth_headers = {"Authorization": f"Basic {basic_auth_token}"}
-        elif basic_auth_username and basic_auth_password:
-            credentials_string = f"{basic_auth_username}:{basic_auth_password}"
-            encoded_credentials = base64.b64encode(credentials_string.encode()).decode()
-            self.auth_headers = {"Authorization": f"Basic {encoded_credentials}"}
-        else:
-            self.auth_headers = {}
-
-        # Initialize session for maintaining cookies and state
+        self.auth_headers = get_basic_auth_headers()
+
+        # Initialize session for maintaining cookies and state, with pooled
+        # connections since barriers poll several pages at a time
         self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=MAX_CONNECTIONS,
+            pool_maxsize=MAX_CONNECTIONS,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=(502, 503, 504),
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self.session.headers.update(
             {
                 "User-Agent": (
@@ -36,44 +145,205 @@ class SidekiqHelper:
             }
         )
 
-    def run_recurring_job(self, job_name: str, timeout: int = 300) -> None:
+    def run_recurring_job(self, job_name: str, timeout: int = 300) -> float:
         """Run a recurring Sidekiq job by name and wait for completion.
 
-        This method triggers a recurring job to run immediately and then waits
-        a reasonable amount of time for it to complete.
-
         Args:
             job_name: The name of the recurring job to run
             timeout: Maximum time to wait for job completion in seconds (default: 300)
-            poll_interval: Time between status checks in seconds (default: 5)
 
         Returns:
-            None
+            The number of seconds spent waiting for the job
 
         Raises:
-            requests.HTTPError: If the API request fails
+            TimeoutError: If the job is still queued or running after `timeout`
+            RuntimeError: If the job failed and was moved to retries or dead
             requests.RequestException: If there's a network or connection error
         """
-        # Get initial stats to track job execution (if available)
-        try:
-            initial_stats = self._get_sidekiq_stats()
-            if isinstance(initial_stats, dict):
-                if (
-                    "sidekiq" in initial_stats
-                    and "enqueued" in initial_stats["sidekiq"]
-                ):
-                    initial_enqueued = initial_stats["sidekiq"]["enqueued"]
-                elif "enqueued" in initial_stats:
-                    initial_enqueued = initial_stats["enqueued"]
-                else:
-                    initial_enqueued = 0
+        return self.run_recurring_jobs(job_name, timeout=timeout)[job_name]
+
+    def run_recurring_jobs(
+        self, *job_names: str, timeout: int = 300
+    ) -> dict[str, float]:
+        """Run recurring Sidekiq jobs together and wait for all of them.
+
+        Each job is tracked by the jids of its class that appear in a queue or
+        as busy after it is enqueued, ignoring those that were already there,
+        so jobs enqueued by other workers do not affect the wait. A job that
+        is never seen counts as done once the processed count has gone up, no
+        job of its class is queued or running, and HEARTBEAT_GRACE_SECONDS
+        have passed, by when the busy page would have shown it.
+
+        Returns:
+            The number of seconds each job blocked for, by job name
+        """
+        runs = []
+        for job_name in job_names:
+            before = self._get_snapshot()
+            self._enqueue_recurring_job(job_name)
+            runs.append(
+                RecurringJobRun(
+                    name=job_name,
+                    enqueued_at=time.monotonic(),
+                    processed_before=before.processed,
+                    existing_job_ids=before.job_ids(
+                        before.job_rows(before.running, _job_token(job_name))
+                    ),
+                )
+            )
+
+        deadline = time.monotonic() + timeout
+        delay = INITIAL_DELAY_SECONDS
+        while pending := [run for run in runs if run.finished_at is None]:
+            if time.monotonic() > deadline:
+                names = [run.name for run in pending]
+                msg = f"Jobs {names} did not complete within {timeout} seconds"
+                raise TimeoutError(msg)
+
+            time.sleep(delay * random.uniform(1 - JITTER, 1 + JITTER))
+            delay = min(delay * BACKOFF_FACTOR, MAX_DELAY_SECONDS)
+
+            snapshot = self._get_snapshot()
+            for run in pending:
+                self._update_run(run, snapshot)
+
+        timings = "\n".join(
+            f"{run.name} ({', '.join(sorted(run.job_ids)) or 'not seen'}): "
+            f"{run.blocked_seconds:.1f}s"
+            for run in runs
+        )
+        _report_blocked_time("Recurring Sidekiq jobs", timings)
+        return {run.name: run.blocked_seconds for run in runs}
+
+    def wait_for_queues_to_drain(
+        self,
+        *queues: str,
+        job_classes: Iterable[str] = (),
+        all_queues: bool = False,
+        timeout: float = 300,
+    ) -> float:
+        """Wait until queues are empty and none of their jobs are busy.
+
+        Use this as a barrier before asserting on the results of background
+        work. Busy jobs are matched by queue name or by any of `job_classes`,
+        and with only `job_classes` given, only queued jobs of those classes
+        are waited for. Jobs of `job_classes` waiting to be retried are also
+        outstanding, and every page of the queues and retries is read. The
+        environment is shared, so waiting for every queue to be empty and no
+        job busy has to be asked for with `all_queues`. The polling interval is
+        kept short while the queues are draining and backs off while they are
+        not.
+
+        Args:
+            queues: The names of the queues to wait for
+            job_classes: Job classes that must not be queued, busy or retrying
+            all_queues: Wait for every queue and busy job instead
+            timeout: Maximum time to wait in seconds (default: 300)
+
+        Returns:
+            The number of seconds spent waiting
+
+        Raises:
+            ValueError: If no queues or job classes are given without all_queues
+            TimeoutError: If the queues have not drained after `timeout`
+        """
+        job_classes = tuple(job_classes)
+        if not (queues or job_classes or all_queues):
+            msg = "Give the queues or job classes to wait for, or all_queues=True"
+            raise ValueError(msg)
+
+        start = time.monotonic()
+        deadline = start + timeout
+        tokens = [_job_token(name) for name in (*queues, *job_classes)]
+        class_tokens = [_job_token(name) for name in job_classes]
+        delay = INITIAL_DELAY_SECONDS
+        outstanding = None
+        polls = 0
+
+        while True:
+            polls += 1
+            if queues or all_queues:
+                sizes = self._get_queue_sizes(queues)
+            else:
+                sizes = {
+                    queue_path.removeprefix("queues/"): len(
+                        _matching_rows(self._get_all_rows(queue_path), tokens)
+                    )
+                    for queue_path in self._get_queue_paths()
+                }
+            busy = [
+                row for row in self._get_all_rows("busy") if JOB_ID_PATTERN.search(row)
+            ]
+            if tokens:
+                busy = _matching_rows(busy, tokens)
+            retrying = (
+                _matching_rows(self._get_all_rows("retries"), class_tokens)
+                if class_tokens
+                else []
+            )
+
+            previous, outstanding = (
+                outstanding,
+                sum(sizes.values()) + len(busy) + len(retrying),
+            )
+            if not outstanding:
+                break
+
+            if time.monotonic() > deadline:
+                msg = (
+                    f"Sidekiq queues did not drain within {timeout} seconds: "
+                    f"{sizes}, {len(busy)} busy, {len(retrying)} retrying"
+                )
+                raise TimeoutError(msg)
+
+            if previous is not None and outstanding < previous:
+                delay = INITIAL_DELAY_SECONDS
             else:
-                initial_enqueued = 0
-            stats_available = True
-        except (requests.HTTPError, requests.RequestException, ValueError, KeyError):
-            initial_enqueued = 0
-            stats_available = False
+                delay = min(delay * BACKOFF_FACTOR, MAX_DELAY_SECONDS)
+            time.sleep(delay * random.uniform(1 - JITTER, 1 + JITTER))
+
+        blocked_seconds = time.monotonic() - start
+        _report_blocked_time(
+            "Sidekiq queue barrier",
+            f"{', '.join((*queues, *job_classes)) or 'all queues'}: "
+            f"{blocked_seconds:.1f}s "
+            f"over {polls} polls",
+        )
+        return blocked_seconds
+
+    def _get_queue_sizes(self, queues: tuple[str, ...]) -> dict[str, int]:
+        response = self.session.get(f"{self.sidekiq_url}/stats/queues", timeout=30)
+        response.raise_for_status()
+        sizes = response.json()
+        if queues:
+            return {queue: sizes.get(queue, 0) for queue in queues}
+        return sizes
 
+    def _update_run(self, run: RecurringJobRun, snapshot: SidekiqSnapshot) -> None:
+        failed = snapshot.job_ids(snapshot.job_rows(snapshot.failed, run.token))
+        if failed & run.job_ids:
+            msg = f"Job {run.name} failed: {sorted(failed & run.job_ids)}"
+            raise RuntimeError(msg)
+
+        rows = snapshot.job_rows(snapshot.running, run.token)
+        running = snapshot.job_ids(rows) - run.existing_job_ids
+        # without a jid to go on, any job of the class counts as this one
+        unidentified = any(not JOB_ID_PATTERN.search(row) for row in rows)
+
+        if running or unidentified:
+            run.job_ids |= running
+            run.seen = True
+        elif run.seen or (
+            # other workers' jobs also count as processed, so only trust this
+            # once the busy page has had time to show the job
+            time.monotonic() - run.enqueued_at >= HEARTBEAT_GRACE_SECONDS
+            and run.processed_before is not None
+            and snapshot.processed is not None
+            and snapshot.processed > run.processed_before
+        ):
+            run.finished_at = time.monotonic()
+
+    def _enqueue_recurring_job(self, job_name: str) -> None:
         enqueue_url = f"{self.sidekiq_url}/recurring-jobs/{job_name}/enqueue"
 
         request_headers = {
@@ -107,77 +377,66 @@ class SidekiqHelper:
             timeout=30,
             allow_redirects=True,
         )
+        response.raise_for_status()
+
+    def _get_queue_paths(self) -> list[str]:
+        queues = self._get_page("queues")
+        return sorted(
+            {
+                match.group(1)
+                for link in queues.links
+                if (
+                    match := QUEUE_PATH_PATTERN.search(urllib.parse.urlsplit(link).path)
+                )
+            }
+        )
+
+    def _get_snapshot(self) -> SidekiqSnapshot:
+        running = self._get_all_rows("busy")
+        for queue_path in self._get_queue_paths():
+            running += self._get_all_rows(queue_path)
+        failed = self._get_all_rows("retries") + self._get_all_rows("morgue")
+
+        return SidekiqSnapshot(
+            running=running, failed=failed, processed=self._get_processed_count()
+        )
+
+    def _get_all_rows(self, path: str) -> list[str]:
+        # queues, retries and the morgue are paginated, and the last page is
+        # the highest one linked to from the first
+        first_page = self._get_page(path)
+        last_page = max(
+            (
+                int(number)
+                for link in first_page.links
+                if urllib.parse.urlsplit(link).path.rstrip("/").endswith(path)
+                for number in urllib.parse.parse_qs(
+                    urllib.parse.urlsplit(link).query
+                ).get("page", [])
+                if number.isdigit()
+            ),
+            default=1,
+        )
 
-        enqueue_response = response
-        enqueue_response.raise_for_status()
-
-        # Use timeout-based waiting strategy
-        if stats_available:
-            # Try polling for a short period, then fall back to time-based wait
-            try:
-                self._poll_for_completion(initial_enqueued, min(60, timeout // 5))
-            except TimeoutError:
-                # Polling failed, fall back to time-based wait for remaining time
-                remaining_time = max(30, min(timeout - 60, 120))
-                time.sleep(remaining_time)
-        else:
-            # If stats unavailable, wait for reasonable portion of timeout
-            wait_time = min(
-                timeout, 60
-            )  # Wait up to 60 seconds or timeout, whichever is less
-            time.sleep(wait_time)
-
-    def _poll_for_completion(self, initial_enqueued: int, timeout: int) -> None:
-        """Poll Sidekiq stats for job completion within timeout period."""
-        start_time = time.time()
-        job_was_enqueued = False
-        poll_interval = 2  # Check every 2 seconds
-
-        # Give some time for the job to be enqueued initially
-        time.sleep(1)
-
-        while time.time() - start_time < timeout:
-            try:
-                current_stats = self._get_sidekiq_stats()
-
-                # Try different ways to access the enqueued count
-                if isinstance(current_stats, dict):
-                    if (
-                        "sidekiq" in current_stats
-                        and "enqueued" in current_stats["sidekiq"]
-                    ):
-                        current_enqueued = current_stats["sidekiq"]["enqueued"]
-                    elif "enqueued" in current_stats:
-                        current_enqueued = current_stats["enqueued"]
-                    else:
-                        current_enqueued = 0
-                else:
-                    current_enqueued = 0
-
-                if current_enqueued > initial_enqueued and not job_was_enqueued:
-                    job_was_enqueued = True
-
-                if job_was_enqueued and current_enqueued <= initial_enqueued:
-                    return  # Job completed successfully
-
-                if job_was_enqueued and current_enqueued == 0:
-                    return  # Job completed successfully
-
-            except (
-                requests.HTTPError,
-                requests.RequestException,
-                ValueError,
-                KeyError,
-            ):
-                # Continue trying rather than failing immediately on stat errors
-                pass
-
-            # Wait before next check
-            time.sleep(poll_interval)
-
-        # If we reach here, job didn't complete within timeout
-        msg = f"Job did not complete within {timeout} seconds"
-        raise TimeoutError(msg)
+        rows = first_page.rows
+        for page_number in range(2, last_page + 1):
+            rows += self._get_page(f"{path}?page={page_number}").rows
+        return rows
+
+    def _get_page(self, path: str) -> _TableRowParser:
+        response = self.session.get(f"{self.sidekiq_url}/{path}", timeout=30)
+        response.raise_for_status()
+
+        parser = _TableRowParser()
+        parser.feed(response.text)
+        return parser
+
+    def _get_processed_count(self) -> int | None:
+        try:
+            stats = self._get_sidekiq_stats()
+        except (requests.RequestException, ValueError):
+            return None
+        return stats.get("sidekiq", stats).get("processed")
 
     def _get_sidekiq_stats(self) -> dict[str, Any]:
         """Internal method to get Sidekiq stats.
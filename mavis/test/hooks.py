@@ -1,9 +1,14 @@
+import os
 from pathlib import Path
 
 import pytest
 from _pytest.main import Session
 from _pytest.reports import TestReport
 
+from mavis.test.artifact_store import artifact_store
+from mavis.test.data import template_cache
+from mavis.test.helpers.imms_api_helper import imms_consistency_stats
+from mavis.test.reload_waits import reload_wait_stats
 from mavis.test.utils import get_current_datetime
 
 path = Path("logs") / "report.log"
@@ -19,7 +24,13 @@ def pytest_sessionstart(session: Session) -> None:
 
 @pytest.hookimpl(trylast=True)
 def pytest_sessionfinish(session: Session, exitstatus: int) -> None:
+    worker_id = os.environ.get("PYTEST_XDIST_WORKER", "main")
+
     with path.open("a") as file:
+        file.write(f"Template cache ({worker_id}): {template_cache}\n")
+        file.write(f"Artifact store ({worker_id}): {artifact_store}\n")
+        file.write(f"Reload waits ({worker_id}): {reload_wait_stats}\n")
+        file.write(f"IMMS API consistency ({worker_id}): {imms_consistency_stats}\n")
         file.write(f"Test Session Ended: {get_current_datetime()}\n")
 
 
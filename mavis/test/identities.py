@@ -0,0 +1,199 @@
+import random
+import re
+import string
+from collections import defaultdict, deque
+from collections.abc import Callable, Mapping, Sequence
+from functools import reduce
+
+import numpy as np
+from faker import Faker
+
+from mavis.test.utils import normalize_postcode
+
+DEFAULT_BATCH_SIZE = 4096
+
+SAFE_EMAIL_DOMAINS = ("example.com", "example.org", "example.net")
+
+Sampler = Callable[[int], np.ndarray]
+
+
+def _provider_attribute(faker: Faker, name: str) -> object:
+    for provider in faker.providers:
+        if hasattr(provider, name):
+            return getattr(provider, name)
+    msg = f"No Faker provider has {name}"
+    raise AttributeError(msg)
+
+
+class IdentityPool:
+    """Synthetic names, emails and addresses sampled in bulk.
+
+    The word lists and formats come from Faker's en_GB providers, but each
+    batch is filled with NumPy indexing instead of one Faker call per value.
+    Every process gets its own entropy-seeded generator, so xdist workers
+    draw independent values; seed() makes a process reproducible.
+    """
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        self.batch_size = batch_size
+        self.rng = np.random.default_rng()
+        self._values: defaultdict[str, deque] = defaultdict(deque)
+
+        faker = Faker(locale="en_GB")
+
+        def words(name: str) -> np.ndarray:
+            return np.array(_provider_attribute(faker, name), dtype=object)
+
+        last_names = _provider_attribute(faker, "last_names")
+        last_name_weights = np.array(list(last_names.values()), dtype=float)
+        self._last_names = np.array(list(last_names), dtype=object)
+        self._last_name_probabilities = last_name_weights / last_name_weights.sum()
+
+        first_names = words("first_names")
+        name_samplers = {
+            "{{first_name}}": self._uniform(first_names),
+            "{{first_name_male}}": self._uniform(words("first_names_male")),
+            "{{first_name_female}}": self._uniform(words("first_names_female")),
+            "{{last_name}}": self._sample_last_names,
+            "{{prefix_male}}": self._uniform(words("prefixes_male")),
+            "{{prefix_female}}": self._uniform(words("prefixes_female")),
+            "{{city_prefix}}": self._uniform(words("city_prefixes")),
+            "{{city_suffix}}": self._uniform(words("city_suffixes")),
+            "{{street_suffix}}": self._uniform(words("street_suffixes")),
+            "#": self._uniform(np.array(list(string.digits), dtype=object)),
+            "?": self._uniform(np.array(list(string.ascii_lowercase), dtype=object)),
+        }
+        postcode_samplers = {
+            character: self._uniform(np.array(list(options), dtype=object))
+            for character, options in _provider_attribute(
+                faker, "_postcode_sets"
+            ).items()
+        }
+
+        self._generators: dict[str, Sampler] = {
+            "first_name": self._uniform(first_names),
+            "last_name": self._sample_last_names,
+            "name_male": self._formats(words("formats_male"), name_samplers),
+            "name_female": self._formats(words("formats_female"), name_samplers),
+            "name_nonbinary": self._formats(
+                ["{{first_name}} {{last_name}}"], name_samplers
+            ),
+            "secondary_address": self._formats(
+                words("secondary_address_formats"), name_samplers
+            ),
+            "street_name": self._formats(words("street_name_formats"), name_samplers),
+            "city": self._formats(words("city_formats"), name_samplers),
+            "postcode": self._normalized_postcodes(
+                self._formats(words("postcode_formats"), postcode_samplers)
+            ),
+            "email": self._emails(first_names),
+        }
+
+    def seed(self, seed: int | str) -> None:
+        self.rng = np.random.default_rng(random.Random(seed).getrandbits(64))
+        self._values.clear()
+
+    def _take(self, kind: str) -> str:
+        values = self._values[kind]
+        if not values:
+            values.extend(self._generators[kind](self.batch_size))
+        return values.popleft()
+
+    def first_name(self) -> str:
+        return self._take("first_name")
+
+    def last_name(self) -> str:
+        return self._take("last_name")
+
+    def name_male(self) -> str:
+        return self._take("name_male")
+
+    def name_female(self) -> str:
+        return self._take("name_female")
+
+    def name_nonbinary(self) -> str:
+        return self._take("name_nonbinary")
+
+    def email(self) -> str:
+        return self._take("email")
+
+    def postcode(self) -> str:
+        return self._take("postcode")
+
+    def address(self) -> tuple[str, str, str, str]:
+        return (
+            self._take("secondary_address"),
+            self._take("street_name"),
+            self._take("city"),
+            self._take("postcode"),
+        )
+
+    def _uniform(self, words: np.ndarray) -> Sampler:
+        def sample(n: int) -> np.ndarray:
+            return words[self.rng.integers(0, len(words), n)]
+
+        return sample
+
+    def _sample_last_names(self, n: int) -> np.ndarray:
+        return self.rng.choice(
+            self._last_names, size=n, p=self._last_name_probabilities
+        )
+
+    def _formats(
+        self, formats: Sequence[str], samplers: Mapping[str, Sampler]
+    ) -> Sampler:
+        """Fill Faker style formats, one vectorised concatenation per format."""
+        pattern = re.compile(
+            "("
+            + "|".join(re.escape(key) for key in sorted(samplers, key=len)[::-1])
+            + ")"
+        )
+        compiled_formats = [pattern.split(format_) for format_ in formats]
+
+        def sample(n: int) -> np.ndarray:
+            chosen = self.rng.integers(0, len(compiled_formats), n)
+            result = np.empty(n, dtype=object)
+
+            for index, parts in enumerate(compiled_formats):
+                rows = np.flatnonzero(chosen == index)
+                columns = [
+                    samplers[part](len(rows)) if part in samplers else part
+                    for part in parts
+                    if part
+                ]
+                result[rows] = reduce(
+                    np.add, columns, np.full(len(rows), "", dtype=object)
+                )
+
+            return result
+
+        return sample
+
+    def _normalized_postcodes(self, sample_postcodes: Sampler) -> Sampler:
+        def sample(n: int) -> np.ndarray:
+            return np.array(
+                [normalize_postcode(postcode) for postcode in sample_postcodes(n)],
+                dtype=object,
+            )
+
+        return sample
+
+    def _emails(self, first_names: np.ndarray) -> Sampler:
+        sample_first_names = self._uniform(first_names)
+        sample_domains = self._uniform(np.array(SAFE_EMAIL_DOMAINS, dtype=object))
+
+        def local_part(names: np.ndarray) -> np.ndarray:
+            return np.char.replace(np.char.lower(names.astype(str)), "'", "").astype(
+                object
+            )
+
+        def sample(n: int) -> np.ndarray:
+            first = local_part(sample_first_names(n))
+            last = local_part(self._sample_last_names(n))
+            number = self.rng.integers(0, 100, n).astype(str).astype(object)
+            return first + "." + last + number + "@" + sample_domains(n)
+
+        return sample
+
+
+identity_pool = IdentityPool()
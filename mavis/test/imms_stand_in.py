@@ -0,0 +1,374 @@
+"""A local stand-in for the IMMS API, for profiling the IMMS helpers offline.
+
+Usage:
+    uv run python -m mavis.test.imms_stand_in --port 8181 \\
+        --latency-ms 50 --consistency-delay 2
+
+Then run with IMMS_BASE_URL=http://localhost:8181/. IMMS_API_PEM must still
+hold an RSA private key to sign the client assertion, but it is not checked.
+"""
+
+import argparse
+import json
+import logging
+import secrets
+import threading
+import time
+import urllib.parse
+import uuid
+from collections import defaultdict
+from collections.abc import Iterator
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import Self
+
+from attr import dataclass
+
+from mavis.test.constants import ImmsEndpoints, Vaccine
+
+logger = logging.getLogger(__name__)
+
+OAUTH_PATH = "/oauth2-mock/token"
+TOKEN_EXPIRES_IN_SECONDS = 599
+NHS_NUMBER_SYSTEM = "https://fhir.nhs.uk/Id/nhs-number"
+
+
+def _target_disease_codes() -> dict[str, set[str]]:
+    # searches name a programme, as -immunization.target=FLU, while records
+    # name the diseases they protect against
+    codes: dict[str, set[str]] = defaultdict(set)
+    for vaccine in Vaccine:
+        try:
+            codes[vaccine.programme.upper()].add(vaccine.target_disease_code)
+        except KeyError:
+            continue
+    return codes
+
+
+TARGET_DISEASE_CODES = _target_disease_codes()
+
+
+@dataclass
+class StoredImmunization:
+    resource: dict
+    nhs_number: str
+    visible_at: float
+
+
+class ImmunizationStore:
+    """Immunizations in memory, indexed by NHS number and target disease.
+
+    A created record only appears in searches `consistency_delay` seconds
+    later, as the IMMS API is eventually consistent.
+    """
+
+    def __init__(self, consistency_delay: float = 0) -> None:
+        self.consistency_delay = consistency_delay
+        self.records: dict[tuple[str, str], list[StoredImmunization]] = defaultdict(
+            list
+        )
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self.lock:
+            return sum(len(records) for records in self.records.values())
+
+    def create(self, resource: dict) -> str:
+        """Store an Immunization, returning its new ID.
+
+        Raises ValueError if it has no patient NHS number or target disease.
+        """
+        patient = next(
+            (
+                contained
+                for contained in resource.get("contained", [])
+                if contained.get("resourceType") == "Patient"
+            ),
+            {},
+        )
+        nhs_number = next(
+            (
+                identifier["value"]
+                for identifier in patient.get("identifier", [])
+                if identifier.get("system") == NHS_NUMBER_SYSTEM
+            ),
+            None,
+        )
+        disease_codes = {
+            coding["code"]
+            for protocol in resource.get("protocolApplied", [])
+            for disease in protocol.get("targetDisease", [])
+            for coding in disease.get("coding", [])
+        }
+        if nhs_number is None or not disease_codes:
+            msg = "Immunization needs a patient NHS number and a target disease"
+            raise ValueError(msg)
+
+        immunization_id = str(uuid.uuid4())
+        stored = StoredImmunization(
+            resource={
+                **resource,
+                "id": immunization_id,
+                # searches identify the patient rather than containing them
+                "patient": {
+                    "reference": f"urn:uuid:{immunization_id}-patient",
+                    "identifier": {"system": NHS_NUMBER_SYSTEM, "value": nhs_number},
+                },
+            },
+            nhs_number=nhs_number,
+            visible_at=time.monotonic() + self.consistency_delay,
+        )
+        stored.resource.pop("contained", None)
+
+        with self.lock:
+            for code in disease_codes:
+                self.records[nhs_number, code].append(stored)
+        return immunization_id
+
+    def search(self, nhs_number: str, target: str) -> Iterator[StoredImmunization]:
+        now = time.monotonic()
+        seen: set[str] = set()
+        with self.lock:
+            matches = [
+                stored
+                for code in TARGET_DISEASE_CODES.get(target.upper(), ())
+                for stored in self.records.get((nhs_number, code), ())
+            ]
+        for stored in matches:
+            if stored.visible_at <= now and stored.resource["id"] not in seen:
+                seen.add(stored.resource["id"])
+                yield stored
+
+
+class _ImmsRequestHandler(BaseHTTPRequestHandler):
+    # keep connections alive so that pooled sessions behave as they would
+    # against the real API
+    protocol_version = "HTTP/1.1"
+    server: "_ImmsServer"
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        logger.debug(format, *args)
+
+    def do_POST(self) -> None:
+        self.server.wait_for_latency()
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        path = urllib.parse.urlparse(self.path).path
+
+        if path == OAUTH_PATH:
+            self._issue_token(body)
+        elif path == ImmsEndpoints.CREATE:
+            self._create_immunization(body)
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, _operation_outcome("not-found"))
+
+    def do_GET(self) -> None:
+        self.server.wait_for_latency()
+        url = urllib.parse.urlparse(self.path)
+
+        if url.path == ImmsEndpoints.READ:
+            self._search_immunizations(urllib.parse.parse_qs(url.query))
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, _operation_outcome("not-found"))
+
+    def _issue_token(self, body: bytes) -> None:
+        form = urllib.parse.parse_qs(body.decode())
+        if form.get("grant_type") != ["client_credentials"] or not form.get(
+            "client_assertion"
+        ):
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "invalid_request"})
+            return
+
+        token = secrets.token_urlsafe(24)
+        self.server.tokens.add(token)
+        self._send_json(
+            HTTPStatus.OK,
+            {
+                "access_token": token,
+                "expires_in": str(TOKEN_EXPIRES_IN_SECONDS),
+                "token_type": "Bearer",
+            },
+        )
+
+    def _is_authorised(self) -> bool:
+        scheme, _, token = self.headers.get("Authorization", "").partition(" ")
+        if scheme == "Bearer" and token in self.server.tokens:
+            return True
+        self._send_json(HTTPStatus.UNAUTHORIZED, _operation_outcome("forbidden"))
+        return False
+
+    def _create_immunization(self, body: bytes) -> None:
+        if not self._is_authorised():
+            return
+        try:
+            immunization_id = self.server.store.create(json.loads(body))
+        except ValueError as error:
+            self._send_json(
+                HTTPStatus.BAD_REQUEST, _operation_outcome("invalid", str(error))
+            )
+            return
+
+        location = urllib.parse.urljoin(
+            f"http://{self.headers.get('Host')}",
+            f"{ImmsEndpoints.CREATE}/{immunization_id}",
+        )
+        self.send_response(HTTPStatus.CREATED)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _search_immunizations(self, query: dict[str, list[str]]) -> None:
+        if not self._is_authorised():
+            return
+        patient = query.get("patient.identifier", [""])[0]
+        system, _, nhs_number = patient.partition("|")
+        target = query.get("-immunization.target", [""])[0]
+        if system != NHS_NUMBER_SYSTEM or not nhs_number or not target:
+            self._send_json(
+                HTTPStatus.BAD_REQUEST,
+                _operation_outcome("invalid", "patient.identifier and target needed"),
+            )
+            return
+
+        entries = [
+            {"resource": stored.resource, "search": {"mode": "match"}}
+            for stored in self.server.store.search(nhs_number, target)
+        ]
+        if entries:
+            entries.append(
+                {
+                    "resource": {
+                        "resourceType": "Patient",
+                        "identifier": [
+                            {"system": NHS_NUMBER_SYSTEM, "value": nhs_number}
+                        ],
+                    },
+                    "search": {"mode": "include"},
+                }
+            )
+        self._send_json(
+            HTTPStatus.OK,
+            {
+                "resourceType": "Bundle",
+                "type": "searchset",
+                "total": len(entries),
+                "entry": entries,
+            },
+        )
+
+    def _send_json(self, status: HTTPStatus, data: dict) -> None:
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/fhir+json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _operation_outcome(code: str, diagnostics: str = "") -> dict:
+    return {
+        "resourceType": "OperationOutcome",
+        "issue": [{"severity": "error", "code": code, "diagnostics": diagnostics}],
+    }
+
+
+class _ImmsServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self, address: tuple[str, int], store: ImmunizationStore, latency: float
+    ) -> None:
+        super().__init__(address, _ImmsRequestHandler)
+        self.store = store
+        self.latency = latency
+        self.tokens: set[str] = set()
+
+    def wait_for_latency(self) -> None:
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+
+class ImmsStandIn:
+    """The stand-in IMMS API served on a background thread.
+
+    Use as a context manager and point IMMS_BASE_URL at `base_url`. Every
+    request waits `latency` seconds before it is handled, and created records
+    appear in searches `consistency_delay` seconds later.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0,
+        consistency_delay: float = 0,
+    ) -> None:
+        self.store = ImmunizationStore(consistency_delay)
+        self.server = _ImmsServer((host, port), self.store, latency)
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self.server.serve_forever, name="imms-stand-in", daemon=True
+        )
+        self._thread.start()
+        logger.info("IMMS API stand-in serving on %s", self.base_url)
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8181)
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=0,
+        help="delay before every request is handled",
+    )
+    parser.add_argument(
+        "--consistency-delay",
+        type=float,
+        default=0,
+        help="seconds before a created record appears in searches",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    stand_in = ImmsStandIn(
+        args.host, args.port, args.latency_ms / 1000, args.consistency_delay
+    )
+    logger.info("IMMS API stand-in serving on %s", stand_in.base_url)
+    try:
+        stand_in.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stand_in.server.server_close()
+        logger.info("Stored %s immunizations", len(stand_in.store))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import logging
+import random
+import time
+from html.parser import HTMLParser
+
+import requests
+from playwright.sync_api import Page
+
+from mavis.test.reload_waits import (
+    BACKOFF_FACTOR,
+    INITIAL_DELAY_SECONDS,
+    JITTER,
+    MAX_DELAY_SECONDS,
+)
+from mavis.test.testing_api import DEFAULT_TIMEOUT_SECONDS
+from mavis.test.utils import get_basic_auth_headers, normalize_whitespace
+
+logger = logging.getLogger(__name__)
+
+IMPORT_STATUSES = ("Completed", "Invalid", "Review and approve")
+IMPORT_TIMEOUT_SECONDS = 60
+
+
+class _StatusTagParser(HTMLParser):
+    # an import's status is shown in a <strong> tag
+    def __init__(self) -> None:
+        super().__init__()
+        self.tags: list[str] = []
+        self._text: list[str] | None = None
+
+    def handle_starttag(self, tag: str, _attrs: list) -> None:
+        if tag == "strong":
+            self._text = []
+
+    def handle_data(self, data: str) -> None:
+        if self._text is not None:
+            self._text.append(data)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "strong" and self._text is not None:
+            self.tags.append(normalize_whitespace("".join(self._text)).strip())
+            self._text = None
+
+
+def parse_import_status(html: str) -> str | None:
+    """The text of the first status tag, matched as get_by_text would.
+
+    That is a case-insensitive substring match, so "Completed with errors"
+    is a completed import.
+    """
+    parser = _StatusTagParser()
+    parser.feed(html)
+    return next(
+        (
+            tag
+            for tag in parser.tags
+            if any(status.lower() in tag.lower() for status in IMPORT_STATUSES)
+        ),
+        None,
+    )
+
+
+class ImportStatusPoller:
+    """Waits for imports to be processed without reloading the browser.
+
+    Import pages are fetched with requests, sending the browser context's
+    cookies, and only their status tags are read.
+    """
+
+    def __init__(self, page: Page) -> None:
+        self.session = requests.Session()
+        self.session.headers.update(get_basic_auth_headers())
+        self.session.headers["Cookie"] = "; ".join(
+            f"{cookie['name']}={cookie['value']}"
+            for cookie in page.context.cookies(page.url)
+        )
+
+    def fetch_status(self, url: str) -> str | None:
+        response = self.session.get(url, timeout=DEFAULT_TIMEOUT_SECONDS)
+        response.raise_for_status()
+        return parse_import_status(response.text)
+
+    def wait_for(self, url: str, seconds: float = IMPORT_TIMEOUT_SECONDS) -> str:
+        """Poll until the import has a status, returning it."""
+        start = time.monotonic()
+        deadline = start + seconds
+        delay = INITIAL_DELAY_SECONDS
+        polls = 0
+
+        while True:
+            polls += 1
+            status = self.fetch_status(url)
+
+            remaining = deadline - time.monotonic()
+            if status is not None or remaining <= 0:
+                break
+
+            jittered = delay * random.uniform(1 - JITTER, 1 + JITTER)
+            time.sleep(min(jittered, remaining))
+            delay = min(delay * BACKOFF_FACTOR, MAX_DELAY_SECONDS)
+
+        logger.info(
+            "Polled import %s times in %.1fs: %s",
+            polls,
+            time.monotonic() - start,
+            status,
+        )
+        if status is None:
+            msg = f"Import not processed within {seconds}s: {url}"
+            raise TimeoutError(msg)
+        return status
@@ -0,0 +1,124 @@
+import json
+import random
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+
+from mavis.test.file_lock import FileLock
+
+# NHS numbers 9000000000-9999999999 are never issued and are used for synthetic
+# patients; their first nine digits are the "bases" allocated here
+SYNTHETIC_BASE_START = 900_000_000
+SYNTHETIC_BASE_COUNT = 100_000_000
+
+CHECKSUM_WEIGHTS = np.arange(10, 1, -1)
+DIGIT_DIVISORS = 10 ** np.arange(8, -1, -1)
+
+DEFAULT_LEDGER_PATH = Path("working") / "nhs_number_ledger.json"
+DEFAULT_BLOCK_SIZE = 10_000
+
+# share of each block kept back for invalid NHS numbers
+INVALID_FRACTION = 0.1
+
+
+def calculate_checksums(bases: np.ndarray) -> np.ndarray:
+    """Vectorised check digits for nine digit bases; 10 means no valid number."""
+    digits = (bases[:, None] // DIGIT_DIVISORS) % 10
+    return (11 - (digits @ CHECKSUM_WEIGHTS) % 11) % 11
+
+
+class NhsNumberLedger:
+    """File-locked record of the next unallocated base, shared by xdist workers.
+
+    A new ledger starts at a random offset so that separate runs (and separate
+    machines) are unlikely to overlap, then hands out consecutive blocks.
+    """
+
+    def __init__(self, path: Path = DEFAULT_LEDGER_PATH) -> None:
+        self.path = path
+        self.lock = FileLock(path.with_suffix(".lock"))
+
+    def allocate(self, block_size: int) -> int:
+        with self.lock:
+            if self.path.exists():
+                start = json.loads(self.path.read_text())["next"]
+            else:
+                start = random.randrange(SYNTHETIC_BASE_COUNT)
+
+            next_start = (start + block_size) % SYNTHETIC_BASE_COUNT
+            self.path.write_text(json.dumps({"next": next_start}))
+
+        return start
+
+
+class NhsNumberPool:
+    """Pre-generated synthetic NHS numbers, drawn from disjoint blocks.
+
+    Each block of bases is shuffled and checksummed in one vectorised batch,
+    so handing out a number is a deque pop rather than a generator call, and
+    numbers never repeat between workers sharing a ledger.
+    """
+
+    def __init__(
+        self,
+        ledger: NhsNumberLedger | None = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ) -> None:
+        self.ledger = ledger or NhsNumberLedger()
+        self.block_size = block_size
+        self.rng = np.random.default_rng()
+
+        self._next_local_start: int | None = None
+        self._valid: deque[str] = deque()
+        self._invalid: deque[str] = deque()
+
+    def seed(self, seed: int | str, start: int) -> None:
+        """Draw blocks from `start` onwards without the ledger, reproducibly."""
+        self.rng = np.random.default_rng(random.Random(seed).getrandbits(64))
+        self._next_local_start = start % SYNTHETIC_BASE_COUNT
+        self._valid.clear()
+        self._invalid.clear()
+
+    def get(self, *, valid: bool = True) -> str:
+        return self.take(1, valid=valid)[0]
+
+    def take(self, quantity: int, *, valid: bool = True) -> list[str]:
+        numbers = self._valid if valid else self._invalid
+        while len(numbers) < quantity:
+            self._fill()
+        return [numbers.popleft() for _ in range(quantity)]
+
+    def _allocate_block(self) -> int:
+        if self._next_local_start is None:
+            return self.ledger.allocate(self.block_size)
+
+        start = self._next_local_start
+        self._next_local_start = (start + self.block_size) % SYNTHETIC_BASE_COUNT
+        return start
+
+    def _fill(self) -> None:
+        start = self._allocate_block()
+        offsets = (start + np.arange(self.block_size)) % SYNTHETIC_BASE_COUNT
+        bases = SYNTHETIC_BASE_START + self.rng.permutation(offsets)
+
+        checksums = calculate_checksums(bases)
+        has_checksum = checksums != 10  # noqa: PLR2004
+        bases, checksums = bases[has_checksum], checksums[has_checksum]
+
+        invalid_count = int(len(bases) * INVALID_FRACTION)
+        wrong_checksums = (
+            checksums[:invalid_count] + self.rng.integers(1, 10, invalid_count)
+        ) % 10
+
+        self._invalid.extend(
+            (bases[:invalid_count] * 10 + wrong_checksums).astype(str).tolist()
+        )
+        self._valid.extend(
+            (bases[invalid_count:] * 10 + checksums[invalid_count:])
+            .astype(str)
+            .tolist()
+        )
+
+
+nhs_number_pool = NhsNumberPool()
@@ -12,6 +12,7 @@ from mavis.test.data_models import (
     Team,
     User,
 )
+from mavis.test.onboarding_pool import OnboardingPool, onboarding_pool_size
 
 
 @dataclass
@@ -116,3 +117,18 @@ class NationalReportingOnboarding(Onboarding):
 
     def to_dict(self) -> dict[str, object]:
         return self._base_dict()
+
+
+@dataclass
+class OnboardedTenant:
+    year_groups: dict[str, int]
+    point_of_care: PointOfCareOnboarding
+    national_reporting: NationalReportingOnboarding
+
+
+def onboarded_tenant_pool(
+    base_url: str, programmes: list[str]
+) -> OnboardingPool[OnboardedTenant]:
+    return OnboardingPool(
+        key=f"{base_url}|{','.join(programmes)}", size=onboarding_pool_size()
+    )
@@ -0,0 +1,270 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import socket
+import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from attr import dataclass
+
+from mavis.test.file_lock import FileLock
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_PATH = Path("working") / "onboarding_pool"
+
+# a lease older than this is reclaimed even if its holder looks alive
+LEASE_MAX_AGE_SECONDS = 12 * 60 * 60
+LEASE_POLL_SECONDS = 1
+LEASE_TIMEOUT_SECONDS = 15 * 60
+
+FREE = "free"
+LEASED = "leased"
+PROVISIONING = "provisioning"
+
+
+def onboarding_pool_size() -> int:
+    """ONBOARDING_POOL_SIZE, or 0 when tenants should not be pooled."""
+    return int(os.getenv("ONBOARDING_POOL_SIZE") or "0")
+
+
+def _process_is_running(pid: int) -> bool:
+    if os.name == "nt":
+        # os.kill would terminate the process on Windows, so rely on the age
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@dataclass
+class Lease[T]:
+    tenant_id: str
+    value: T
+
+
+class OnboardingPool[T]:
+    """Onboarded tenants shared between xdist workers, and between runs.
+
+    The registry is a JSON file guarded by a FileLock and only ever held for
+    bookkeeping; provisioning and resets happen outside the lock. A worker
+    that finds no free tenant provisions the missing ones in parallel, keeps
+    one and frees the rest for other workers. The pool never grows past
+    `size`, so once every tenant is leased workers wait for one to be
+    released. Released tenants are marked dirty and reset before they are
+    next leased. Leases held by processes that have died on this host, or
+    held for longer than LEASE_MAX_AGE_SECONDS, are reclaimed.
+    """
+
+    def __init__(self, key: str, size: int, root: Path = DEFAULT_POOL_PATH) -> None:
+        self.size = size
+        self.path = root / hashlib.sha256(key.encode()).hexdigest()[:16]
+        self.registry_path = self.path / "registry.json"
+        self.lock = FileLock(self.path / "registry.lock")
+
+    def lease(
+        self,
+        provision: Callable[[], T],
+        reset: Callable[[T], None],
+        timeout: float = LEASE_TIMEOUT_SECONDS,
+    ) -> Lease[T]:
+        deadline = time.monotonic() + timeout
+
+        while True:
+            with self.lock:
+                registry = self._read_registry()
+                self._reap(registry)
+                tenant_id, new_ids = self._claim(registry)
+                self._write_registry(registry)
+
+            if tenant_id is not None:
+                return self._prepare(tenant_id, registry["tenants"][tenant_id], reset)
+            if new_ids:
+                return self._provision(new_ids, provision)
+
+            if time.monotonic() > deadline:
+                msg = f"No onboarding tenant became free within {timeout}s"
+                raise TimeoutError(msg)
+            time.sleep(LEASE_POLL_SECONDS)
+
+    def release(self, lease: Lease[T]) -> None:
+        with self.lock:
+            registry = self._read_registry()
+            tenant = registry["tenants"].get(lease.tenant_id)
+            if tenant is not None and self._is_held_here(tenant):
+                tenant.update(state=FREE, holder=None, dirty=True)
+                self._write_registry(registry)
+
+    def drain(self, delete: Callable[[T], None]) -> int:
+        """Delete every tenant that is not leased, returning how many."""
+        with self.lock:
+            registry = self._read_registry()
+            self._reap(registry)
+            free_ids = [
+                tenant_id
+                for tenant_id, tenant in registry["tenants"].items()
+                if tenant["state"] == FREE
+            ]
+            for tenant_id in free_ids:
+                del registry["tenants"][tenant_id]
+            self._write_registry(registry)
+
+        for tenant_id in free_ids:
+            delete(self._load(tenant_id))
+            self._value_path(tenant_id).unlink(missing_ok=True)
+        return len(free_ids)
+
+    def _claim(self, registry: dict) -> tuple[str | None, list[str]]:
+        tenants = registry["tenants"]
+        free_ids = [
+            tenant_id
+            for tenant_id, tenant in tenants.items()
+            if tenant["state"] == FREE
+        ]
+        if free_ids:
+            # prefer clean tenants, which need no reset
+            tenant_id = min(free_ids, key=lambda it: tenants[it]["dirty"])
+            tenants[tenant_id].update(state=LEASED, holder=self._holder())
+            return tenant_id, []
+
+        if any(tenant["state"] == PROVISIONING for tenant in tenants.values()):
+            return None, []  # wait for the worker that is provisioning
+
+        missing = self.size - len(tenants)
+        if missing <= 0:
+            return None, []  # wait for a leased tenant to be released
+
+        new_ids = [uuid.uuid4().hex for _ in range(missing)]
+        for new_id in new_ids:
+            tenants[new_id] = {
+                "state": PROVISIONING,
+                "holder": self._holder(),
+                "dirty": False,
+            }
+        return None, new_ids
+
+    def _provision(self, new_ids: list[str], provision: Callable[[], T]) -> Lease[T]:
+        logger.info("Provisioning %s onboarding tenants", len(new_ids))
+
+        def provision_and_store(new_id: str) -> T:
+            # stored straight away, so that a tenant provisioned by a worker
+            # that then dies can still be reclaimed rather than leaked
+            value = provision()
+            self._store(new_id, value)
+            return value
+
+        with ThreadPoolExecutor(max_workers=len(new_ids)) as executor:
+            futures = {
+                new_id: executor.submit(provision_and_store, new_id)
+                for new_id in new_ids
+            }
+
+        provisioned = {}
+        for new_id, future in futures.items():
+            try:
+                provisioned[new_id] = future.result()
+            except Exception:
+                logger.exception("Failed to provision onboarding tenant")
+
+        with self.lock:
+            registry = self._read_registry()
+            tenants = registry["tenants"]
+            for new_id in new_ids:
+                if new_id not in provisioned:
+                    tenants.pop(new_id, None)
+            kept_id = next(iter(provisioned), None)
+            for new_id in provisioned:
+                if new_id == kept_id:
+                    tenants[new_id].update(state=LEASED, holder=self._holder())
+                else:
+                    tenants[new_id].update(state=FREE, holder=None)
+            self._write_registry(registry)
+
+        if kept_id is None:
+            msg = "Failed to provision any onboarding tenants"
+            raise RuntimeError(msg)
+        return Lease(tenant_id=kept_id, value=provisioned[kept_id])
+
+    def _prepare(
+        self, tenant_id: str, tenant: dict, reset: Callable[[T], None]
+    ) -> Lease[T]:
+        value = self._load(tenant_id)
+        if tenant["dirty"]:
+            reset(value)
+            with self.lock:
+                registry = self._read_registry()
+                registry["tenants"][tenant_id]["dirty"] = False
+                self._write_registry(registry)
+        return Lease(tenant_id=tenant_id, value=value)
+
+    def _reap(self, registry: dict) -> None:
+        hostname = socket.gethostname()
+        now = time.time()
+
+        for tenant_id, tenant in list(registry["tenants"].items()):
+            holder = tenant["holder"]
+            if holder is None:
+                continue
+
+            expired = now - holder["since"] > LEASE_MAX_AGE_SECONDS
+            dead = holder["host"] == hostname and not _process_is_running(holder["pid"])
+            if not (expired or dead):
+                continue
+
+            logger.warning("Reclaiming onboarding tenant %s from %s", tenant_id, holder)
+            if (
+                tenant["state"] == PROVISIONING
+                and not self._value_path(tenant_id).exists()
+            ):
+                # provisioning never finished, so there is no team to delete
+                del registry["tenants"][tenant_id]
+            else:
+                # kept, so that it is reused or deleted by drain
+                tenant.update(state=FREE, holder=None, dirty=True)
+
+    @staticmethod
+    def _is_held_here(tenant: dict) -> bool:
+        holder = tenant["holder"]
+        return (
+            holder is not None
+            and holder["host"] == socket.gethostname()
+            and holder["pid"] == os.getpid()
+        )
+
+    @staticmethod
+    def _holder() -> dict:
+        return {
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+            "worker": os.environ.get("PYTEST_XDIST_WORKER", "main"),
+            "since": time.time(),
+        }
+
+    def _read_registry(self) -> dict:
+        if not self.registry_path.exists():
+            return {"tenants": {}}
+        return json.loads(self.registry_path.read_text())
+
+    def _write_registry(self, registry: dict) -> None:
+        temporary = self.registry_path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(registry, indent=2))
+        temporary.replace(self.registry_path)
+
+    def _value_path(self, tenant_id: str) -> Path:
+        return self.path / f"{tenant_id}.pickle"
+
+    def _store(self, tenant_id: str, value: T) -> None:
+        self._value_path(tenant_id).write_bytes(pickle.dumps(value))
+
+    def _load(self, tenant_id: str) -> T:
+        # only ever written by _store in this pool
+        return pickle.loads(self._value_path(tenant_id).read_bytes())  # noqa: S301
@@ -8,7 +8,6 @@ from .children import (
 )
 from .dashboard_page import DashboardPage
 from .error_pages import BadRequestPage, ServiceErrorPage
-from .flipper_page import FlipperPage
 from .imports import ImportRecordsWizardPage, ImportsPage
 from .log_in_page import LogInPage
 from .log_out_page import LogOutPage
@@ -57,7 +56,6 @@ __all__ = [
     "DashboardPage",
     "DownloadSchoolMovesPage",
     "EditVaccinationRecordPage",
-    "FlipperPage",
     "GillickCompetencePage",
     "ImportRecordsWizardPage",
     "ImportsPage",
@@ -1,17 +1,23 @@
+import logging
 import re
 from pathlib import Path
 
+import requests
 from playwright.sync_api import Locator, Page, expect
 
 from mavis.test.annotations import step
 from mavis.test.constants import Programme
 from mavis.test.data import FileGenerator, FileMapping, read_scenario_list_from_file
 from mavis.test.data.file_mappings import ImportFormatDetails
+from mavis.test.import_status import IMPORT_TIMEOUT_SECONDS, ImportStatusPoller
 from mavis.test.pages.header_component import HeaderComponent
 from mavis.test.utils import (
+    expect_text_lines,
     reload_until_element_is_visible,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class ImportRecordsWizardPage:
     def __init__(
@@ -122,7 +128,25 @@ class ImportRecordsWizardPage:
             .first
         )
 
-        reload_until_element_is_visible(self.page, tag, seconds=60)
+        self._wait_for_import_status(tag)
+
+    def _wait_for_import_status(self, tag: Locator) -> None:
+        if tag.is_visible():
+            return
+
+        try:
+            ImportStatusPoller(self.page).wait_for(self.page.url)
+        except requests.RequestException:
+            logger.warning("Reloading import page to wait for it", exc_info=True)
+            reload_until_element_is_visible(
+                self.page, tag, seconds=IMPORT_TIMEOUT_SECONDS
+            )
+            return
+        except TimeoutError:
+            pass  # the expect below fails with what the page shows
+
+        self.page.reload()
+        expect(tag).to_be_visible()
 
     def navigate_to_child_record_import(self) -> None:
         self.select_child_records()
@@ -199,14 +223,14 @@ class ImportRecordsWizardPage:
         if self.is_preview_page_link_visible():
             self.approve_preview_if_shown(input_file_path)
 
-    @step("Reload until completed status appears")
+    @step("Wait until completed status appears")
     def wait_for_completed_status(self) -> None:
         status_text = (
             self.review_and_approve_tag.or_(self.completed_tag)
             .or_(self.invalid_tag)
             .or_(self.invalid_file_problem)
         ).first
-        reload_until_element_is_visible(self.page, status_text, seconds=60)
+        self._wait_for_import_status(status_text)
 
     @step("Click import link for {1}")
     def click_import_link(self, file_path: Path) -> None:
@@ -227,11 +251,7 @@ class ImportRecordsWizardPage:
     def verify_upload_output(self, file_path: Path) -> None:
         _expected_errors = self.file_generator.get_expected_errors(file_path)
         if _expected_errors is not None:
-            for _msg in _expected_errors:
-                if _msg.startswith("!"):
-                    expect(self.page.get_by_role("main")).not_to_contain_text(_msg[1:])
-                else:
-                    expect(self.page.get_by_role("main")).to_contain_text(_msg)
+            expect_text_lines(self.page.get_by_role("main"), _expected_errors)
 
     @step("Select year groups {1}")
     def select_year_groups(self, *year_groups: int) -> None:
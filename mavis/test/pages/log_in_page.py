@@ -1,12 +1,14 @@
 from pathlib import Path
 
-from playwright.sync_api import Page, expect
+from playwright.sync_api import Page, StorageState, expect
 
 from mavis.test.annotations import step
 from mavis.test.data_models import Organisation, Team, User
 from mavis.test.pages.header_component import HeaderComponent
 from mavis.test.utils import get_current_datetime
 
+SAVED_SESSION_TIMEOUT_MS = 10_000
+
 
 class LogInPage:
     """
@@ -102,6 +104,42 @@ class LogInPage:
             self.continue_button.click()
         expect(self.log_out_button).to_be_visible()
 
+    @step("Log in as {1} and choose team {2}, reusing a saved session")
+    def log_in_reusing_storage_state(
+        self,
+        user: User,
+        team: Team,
+        storage_states: dict[tuple[str, str], StorageState],
+    ) -> None:
+        """Restore the user's saved cookies, or log in and save them.
+
+        A saved session that no longer shows the dashboard (for example after
+        the user logged out) is discarded and replaced by a real log in.
+        """
+        key = (user.username, team.workgroup)
+        storage_state = storage_states.pop(key, None)
+
+        if storage_state is not None:
+            self.page.context.add_cookies(storage_state["cookies"])
+            self.page.goto("/dashboard")
+            try:
+                # a slow render must not be mistaken for an expired session
+                expect(self.log_out_button).to_be_visible(
+                    timeout=SAVED_SESSION_TIMEOUT_MS
+                )
+            except AssertionError:
+                self.page.context.clear_cookies()
+            else:
+                self.current_user = user
+                self.current_org_code = team.workgroup
+                self._write_audit_log("LOGIN_REUSED", user, team.workgroup)
+                storage_states[key] = storage_state
+                return
+
+        self.navigate()
+        self.log_in_and_choose_team_if_necessary(user, team)
+        storage_states[key] = self.page.context.storage_state()
+
 
 class LogOutPage:
     def __init__(self, page: Page) -> None:
@@ -4,6 +4,7 @@ import pandas as pd
 from playwright.sync_api import Page
 
 from mavis.test.annotations import step
+from mavis.test.artifact_store import artifact_store
 from mavis.test.constants import Programme
 from mavis.test.pages.header_component import HeaderComponent
 from mavis.test.pages.reports.reports_tabs import ReportsTabs
@@ -36,7 +37,7 @@ class ReportsDownloadPage:
             self.click_download_button()
         download = download_info.value
         download.save_as(_file_path)
-        return pd.read_csv(_file_path)
+        return pd.read_csv(artifact_store.deduplicate(_file_path))
 
     def check_vaccinated_values(
         self,
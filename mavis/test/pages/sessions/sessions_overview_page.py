@@ -1,18 +1,30 @@
 import re
 import time
+from collections.abc import Iterator
+from contextlib import closing
 from datetime import date
 from pathlib import Path
 
-import pandas as pd
 from playwright.sync_api import Page, expect
 
 from mavis.test.annotations import step
+from mavis.test.artifact_store import artifact_store
 from mavis.test.constants import (
     Programme,
     Vaccine,
 )
 from mavis.test.data import get_session_id
-from mavis.test.data_models import Child, School, User, VaccinationRecord
+from mavis.test.data.spreadsheet_reader import (
+    SpreadsheetRow,
+    iter_spreadsheet_rows,
+)
+from mavis.test.data_models import (
+    Child,
+    Location,
+    School,
+    User,
+    VaccinationRecord,
+)
 from mavis.test.pages.header_component import HeaderComponent
 from mavis.test.pages.sessions.sessions_tabs import SessionsTabs
 from mavis.test.utils import (
@@ -141,11 +153,28 @@ class SessionsOverviewPage:
         download = download_info.value
         download.save_as(_file_path)
 
-        return _file_path
+        return artifact_store.deduplicate(_file_path)
 
-    def get_offline_recording_dataframe(self) -> pd.DataFrame:
+    def get_offline_recording_rows(
+        self, columns: list[str] | None = None
+    ) -> Iterator[SpreadsheetRow]:
         file_path = self.download_offline_recording_excel()
-        return pd.read_excel(file_path, sheet_name="Vaccinations", dtype=str)
+        return iter_spreadsheet_rows(file_path, columns=columns)
+
+    def find_offline_recording_row(
+        self, child: Child, **expected: str
+    ) -> SpreadsheetRow | None:
+        with closing(self.get_offline_recording_rows()) as rows:
+            return next(
+                (
+                    row
+                    for row in rows
+                    if row["PERSON_FORENAME"] == child.first_name
+                    and row["PERSON_SURNAME"] == child.last_name
+                    and all(row[key] == value for key, value in expected.items())
+                ),
+                None,
+            )
 
     @step("Download the offline recording excel and verify consent message pattern")
     def verify_offline_sheet_vaccination_row(
@@ -160,22 +189,16 @@ class SessionsOverviewPage:
         child = vaccination_record.child
         programme = vaccination_record.programme
 
-        _data_frame = self.get_offline_recording_dataframe()
-        row = _data_frame[
-            (_data_frame["PERSON_FORENAME"] == child.first_name)
-            & (_data_frame["PERSON_SURNAME"] == child.last_name)
-            & (_data_frame["VACCINATED"] == "Y")
-            & (_data_frame["PROGRAMME"] == programme.offline_sheet_name)
-        ]
-        if row.empty:
+        row = self.find_offline_recording_row(
+            child, VACCINATED="Y", PROGRAMME=programme.offline_sheet_name
+        )
+        if row is None:
             msg = (
                 f"No matching row found for {child!s} "
                 f"and programme {programme} in offline recording excel."
             )
             raise ValueError(msg)
 
-        row = row.iloc[0]
-
         assert row["ORGANISATION_CODE"]
         assert row["SCHOOL_NAME"] == school.name
         assert row["PERSON_DOB"] == child.date_of_birth.strftime("%Y-%m-%d %H:%M:%S")
@@ -206,24 +229,17 @@ class SessionsOverviewPage:
         *,
         competent: bool,
     ) -> None:
-        _data_frame = self.get_offline_recording_dataframe()
         competence_status = (
             "Gillick competent" if competent else "Not Gillick competent"
         )
-        row = _data_frame[
-            (_data_frame["PERSON_FORENAME"] == child.first_name)
-            & (_data_frame["PERSON_SURNAME"] == child.last_name)
-            & (_data_frame["GILLICK_STATUS"] == competence_status)
-        ]
-        if row.empty:
+        row = self.find_offline_recording_row(child, GILLICK_STATUS=competence_status)
+        if row is None:
             msg = (
                 f"No corresponding Gillick competence found for {child!s} "
                 "in offline recording excel."
             )
             raise ValueError(msg)
 
-        row = row.iloc[0]
-
         assert row["GILLICK_ASSESSMENT_DATE"].split(" ")[
             0
         ] == get_todays_date().strftime("%Y-%m-%d")
@@ -234,21 +250,14 @@ class SessionsOverviewPage:
         self,
         child: Child,
     ) -> None:
-        _data_frame = self.get_offline_recording_dataframe()
-        row = _data_frame[
-            (_data_frame["PERSON_FORENAME"] == child.first_name)
-            & (_data_frame["PERSON_SURNAME"] == child.last_name)
-            & (_data_frame["TRIAGE_STATUS"] == "Safe to vaccinate")
-        ]
-        if row.empty:
+        row = self.find_offline_recording_row(child, TRIAGE_STATUS="Safe to vaccinate")
+        if row is None:
             msg = (
                 f"No corresponding triage status found for {child!s} "
                 "in offline recording excel."
             )
             raise ValueError(msg)
 
-        row = row.iloc[0]
-
         assert row["TRIAGE_DATE"].split(" ")[0] == get_todays_date().strftime(
             "%Y-%m-%d"
         )
@@ -259,13 +268,8 @@ class SessionsOverviewPage:
         self,
         child: Child,
     ) -> None:
-        _data_frame = self.get_offline_recording_dataframe()
-        row = _data_frame[
-            (_data_frame["PERSON_FORENAME"] == child.first_name)
-            & (_data_frame["PERSON_SURNAME"] == child.last_name)
-            & (_data_frame["PSD_STATUS"] == "PSD added")
-        ]
-        if row.empty:
+        row = self.find_offline_recording_row(child, PSD_STATUS="PSD added")
+        if row is None:
             msg = (
                 f"No corresponding psd status found for {child!s} "
                 "in offline recording excel."
@@ -274,16 +278,20 @@ class SessionsOverviewPage:
 
     @step("Download the offline recording excel and verify consent message pattern")
     def verify_consent_message_in_excel(self) -> None:
-        _data_frame = self.get_offline_recording_dataframe()
         _consent_details_pattern = (
             r"On \d{4}-\d{2}-\d{2} at \d{2}:\d{2} (GIVEN|REFUSED) by "
             r"[A-Z][a-z]+(?: [A-Z][a-z]+)*"
         )
-        invalid_found = _data_frame["CONSENT_DETAILS"].apply(
-            lambda x: pd.notna(x) and len(re.findall(_consent_details_pattern, x)) == 0
-        )
+        with closing(
+            self.get_offline_recording_rows(columns=["CONSENT_DETAILS"])
+        ) as rows:
+            invalid_found = any(
+                row["CONSENT_DETAILS"] is not None
+                and not re.search(_consent_details_pattern, row["CONSENT_DETAILS"])
+                for row in rows
+            )
         # Raise error if any invalid entry is found
-        if invalid_found.any():
+        if invalid_found:
             msg = "CONSENT_DETAILS has entries in an invalid format."
             raise ValueError(msg)
 
@@ -305,6 +313,18 @@ class SessionsOverviewPage:
             get_formatted_date_for_session_dates(date)
         ).first.is_visible()
 
+    def is_session_for(
+        self, location: Location, programmes: list[Programme], date: date
+    ) -> bool:
+        return (
+            self.page.locator("h1", has_text=str(location)).is_visible()
+            and self.is_date_scheduled(date)
+            and all(
+                self.page.get_by_text(str(programme)).first.is_visible()
+                for programme in programmes
+            )
+        )
+
     @step("Click Consent refused")
     def click_consent_refused(self) -> None:
         self.consent_refused_link.click()
@@ -57,8 +57,11 @@ class SessionsSearchPage:
         )
         session_date = get_formatted_date_without_year(get_offset_date(date_offset))
 
-        for i in range(session_locators.count()):
-            card_text = session_locators.nth(i).inner_text()
+        # read every card at once rather than one round trip per card
+        card_texts = session_locators.evaluate_all(
+            "cards => cards.map(card => card.innerText)"
+        )
+        for i, card_text in enumerate(card_texts):
             if (
                 all(str(programme) in card_text for programme in programmes)
                 and session_date in card_text
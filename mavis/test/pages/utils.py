@@ -1,11 +1,26 @@
-from playwright.sync_api import Page
+import logging
+
+from playwright.sync_api import Page, expect
 
 from mavis.test.constants import (
     MAVIS_NOTE_LENGTH_LIMIT,
     ConsentMethod,
     Programme,
 )
-from mavis.test.data_models import Child, Clinic, School, VaccinationRecord
+from mavis.test.data_models import (
+    Child,
+    Clinic,
+    Location,
+    School,
+    VaccinationRecord,
+)
+from mavis.test.form_seeding import (
+    FORMS,
+    FormSeeder,
+    SeedingError,
+    seeded_records,
+    seeding_mode,
+)
 from mavis.test.pages import (
     AddSessionWizardPage,
     DashboardPage,
@@ -16,7 +31,9 @@ from mavis.test.pages import (
     SessionsSearchPage,
     SessionsVaccinationWizardPage,
 )
-from mavis.test.utils import generate_random_string
+from mavis.test.utils import generate_random_string, get_offset_date
+
+logger = logging.getLogger(__name__)
 
 
 def schedule_school_session_if_needed(
@@ -26,6 +43,17 @@ def schedule_school_session_if_needed(
     year_groups: list[int],
     date_offset: int = 0,
 ) -> None:
+    if _go_to_recorded_session(page, school, programmes, year_groups, date_offset):
+        return
+
+    if seeding_mode() == FORMS:
+        try:
+            _seed_school_session(page, school, programmes, year_groups, date_offset)
+        except SeedingError:
+            logger.warning("Scheduling session through the UI", exc_info=True)
+        else:
+            return
+
     DashboardPage(page).header.click_mavis_header()
     DashboardPage(page).click_sessions()
     if not SessionsSearchPage(page).click_session_if_exists(
@@ -35,6 +63,62 @@ def schedule_school_session_if_needed(
         AddSessionWizardPage(page).schedule_school_session(
             school, programmes, year_groups, date_offset
         )
+    _record_session(page, school, programmes, year_groups, date_offset)
+
+
+def _seed_school_session(
+    page: Page,
+    school: School,
+    programmes: list[Programme],
+    year_groups: list[int],
+    date_offset: int,
+) -> None:
+    seeder = FormSeeder(page)
+    session_url = seeder.find_school_session(
+        school, programmes, year_groups, date_offset
+    ) or seeder.schedule_school_session(school, programmes, year_groups, date_offset)
+
+    key = seeded_records.session_key(school, programmes, year_groups, date_offset)
+    seeded_records.sessions[key] = session_url
+    page.goto(session_url)
+
+
+def _go_to_recorded_session(
+    page: Page,
+    location: Location,
+    programmes: list[Programme],
+    year_groups: list[int],
+    date_offset: int,
+) -> bool:
+    key = seeded_records.session_key(location, programmes, year_groups, date_offset)
+    session_url = seeded_records.sessions.get(key)
+    if session_url is None:
+        return False
+
+    page.goto(session_url)
+    # tests can change a session's dates or programmes, so it is searched for
+    # again if it no longer matches
+    if SessionsOverviewPage(page).is_session_for(
+        location, programmes, get_offset_date(date_offset)
+    ):
+        return True
+    del seeded_records.sessions[key]
+    return False
+
+
+def _record_session(
+    page: Page,
+    location: Location,
+    programmes: list[Programme],
+    year_groups: list[int],
+    date_offset: int,
+) -> None:
+    # the session page is headed with its location, as in
+    # SessionsSearchPage.click_session_for_programme_group
+    expect(page.locator("h1", has_text=str(location))).to_be_visible()
+
+    key = seeded_records.session_key(location, programmes, year_groups, date_offset)
+    seeded_records.sessions[key] = page.url
 
 
 def schedule_community_clinic_session_if_needed(
@@ -42,13 +126,18 @@ def schedule_community_clinic_session_if_needed(
     programmes: list[Programme],
     date_offset: int = 0,
 ) -> None:
+    clinic = Clinic("community clinic")
+    if _go_to_recorded_session(page, clinic, programmes, [], date_offset):
+        return
+
     DashboardPage(page).header.click_mavis_header()
     DashboardPage(page).click_sessions()
     if not SessionsSearchPage(page).click_session_if_exists(
-        Clinic("community clinic"), programmes, [], date_offset
+        clinic, programmes, [], date_offset
     ):
         SessionsSearchPage(page).click_add_a_new_session()
         AddSessionWizardPage(page).schedule_clinic_session(programmes, date_offset)
+    _record_session(page, clinic, programmes, [], date_offset)
 
 
 def prepare_child_for_vaccination(
@@ -0,0 +1,109 @@
+import contextlib
+import logging
+import random
+import statistics
+import time
+from collections.abc import Callable
+
+from attr import dataclass, field
+from playwright.sync_api import Page, Response
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+logger = logging.getLogger(__name__)
+
+INITIAL_DELAY_SECONDS = 0.5
+MAX_DELAY_SECONDS = 5
+BACKOFF_FACTOR = 1.5
+JITTER = 0.25
+
+# the reload loops these waits replaced made seconds * 2 attempts, each
+# sleeping 0.5s and then reloading, so they took about twice `seconds` or more
+DEADLINE_FACTOR = 2
+LIVE_RESOURCE_TYPES = frozenset({"document", "fetch", "xhr", "eventsource"})
+
+
+@dataclass
+class ReloadWaitStats:
+    """Latency and reloads of every reload wait in this worker."""
+
+    latencies: list[float] = field(factory=list)
+    reloads: int = 0
+    timeouts: int = 0
+
+    def record(self, latency: float, reloads: int, *, satisfied: bool) -> None:
+        self.latencies.append(latency)
+        self.reloads += reloads
+        self.timeouts += not satisfied
+
+    def __str__(self) -> str:
+        if not self.latencies:
+            return "no waits"
+        return (
+            f"{len(self.latencies)} waits, {self.reloads} reloads, "
+            f"{self.timeouts} timed out, "
+            f"median {statistics.median(self.latencies):.1f}s, "
+            f"max {max(self.latencies):.1f}s"
+        )
+
+
+reload_wait_stats = ReloadWaitStats()
+
+
+def _wait_for_live_response(page: Page, seconds: float) -> None:
+    # returns early if the page fetches anything, which may have updated it
+    with contextlib.suppress(PlaywrightTimeoutError):
+        page.wait_for_event(
+            "response",
+            predicate=lambda response: (
+                isinstance(response, Response)
+                and response.request.resource_type in LIVE_RESOURCE_TYPES
+            ),
+            timeout=seconds * 1000,
+        )
+
+
+def reload_until(
+    page: Page, condition: Callable[[], bool], seconds: float, description: str
+) -> bool:
+    """Reload the page until `condition` holds, returning whether it did.
+
+    Between reloads the wait backs off exponentially with jitter. The
+    condition is checked again whenever the page itself fetches something
+    during a wait, and the page is only reloaded once the whole wait has
+    passed without it holding. The deadline is
+    `seconds * DEADLINE_FACTOR`, which keeps the bound of the old reload loops.
+    """
+    start = time.monotonic()
+    deadline = start + seconds * DEADLINE_FACTOR
+    delay = INITIAL_DELAY_SECONDS
+    reloads = 0
+
+    while not (satisfied := condition()):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+
+        jittered = delay * random.uniform(1 - JITTER, 1 + JITTER)
+        wait_until = time.monotonic() + min(jittered, remaining)
+        # pages that poll in the background respond often, so a response only
+        # ends the wait early if it satisfied the condition
+        while (
+            not (satisfied := condition())
+            and (left := wait_until - time.monotonic()) > 0
+        ):
+            _wait_for_live_response(page, left)
+        delay = min(delay * BACKOFF_FACTOR, MAX_DELAY_SECONDS)
+        if not satisfied:
+            page.reload()
+            reloads += 1
+
+    latency = time.monotonic() - start
+    reload_wait_stats.record(latency, reloads, satisfied=satisfied)
+    logger.info(
+        "Waited %.1fs until %s with %s reloads%s",
+        latency,
+        description,
+        reloads,
+        "" if satisfied else ", timed out",
+    )
+    return satisfied
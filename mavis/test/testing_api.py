@@ -0,0 +1,95 @@
+import functools
+import logging
+import time
+import urllib.parse
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT_SECONDS = 30
+MAX_CONNECTIONS = 16
+
+
+class TestingApiClient:
+    """Keep-alive client for the api/testing endpoints, shared per process.
+
+    Connections are pooled, idempotent requests are retried with backoff on
+    connection errors and gateway failures, and every call is logged with its
+    duration so that slow setup is visible in logs/pytest.log.
+    """
+
+    __test__ = False  # not a pytest test class
+
+    def __init__(self, base_url: str) -> None:
+        self.base_url = base_url
+        self.session = requests.Session()
+
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=MAX_CONNECTIONS,
+            pool_maxsize=MAX_CONNECTIONS,
+            max_retries=retry,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, method: str, path: str, **kwargs: object) -> requests.Response:
+        url = urllib.parse.urljoin(self.base_url, path)
+        kwargs.setdefault("timeout", DEFAULT_TIMEOUT_SECONDS)
+
+        start = time.perf_counter()
+        response = self.session.request(method, url, **kwargs)
+        logger.info(
+            "%s %s -> %s in %.0fms",
+            method,
+            path,
+            response.status_code,
+            (time.perf_counter() - start) * 1000,
+        )
+        return response
+
+    def get(self, path: str, **kwargs: object) -> requests.Response:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs: object) -> requests.Response:
+        return self.request("POST", path, **kwargs)
+
+    def delete(self, path: str, **kwargs: object) -> requests.Response:
+        return self.request("DELETE", path, **kwargs)
+
+    def get_json(self, path: str, **kwargs: object) -> object:
+        response = self.get(path, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+
+@functools.cache
+def get_testing_api_client(base_url: str) -> TestingApiClient:
+    return TestingApiClient(base_url)
+
+
+def run_concurrently[T](*calls: Callable[[], T]) -> list[T]:
+    """Run independent calls on their own threads, returning their results.
+
+    Calls may themselves run calls concurrently, so each batch gets its own
+    threads rather than sharing a fixed-size executor. The first exception
+    raised by a call is re-raised once all of them have finished.
+    """
+    if len(calls) <= 1:
+        return [call() for call in calls]
+
+    with ThreadPoolExecutor(
+        max_workers=len(calls), thread_name_prefix="testing-api"
+    ) as executor:
+        futures = [executor.submit(call) for call in calls]
+    return [future.result() for future in futures]
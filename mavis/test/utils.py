@@ -1,3 +1,5 @@
+import base64
+import os
 import random
 import re
 import time
@@ -8,10 +10,26 @@ from faker import Faker
 from playwright.sync_api import Locator, Page, expect
 
 from mavis.test.annotations import step
+from mavis.test.reload_waits import reload_until
 
 faker = Faker()
 
 
+def get_basic_auth_headers() -> dict[str, str]:
+    """Headers for environments behind basic auth, as browser_context_args."""
+    basic_auth_token = os.environ.get("BASIC_AUTH_TOKEN")
+    basic_auth_username = os.environ.get("BASIC_AUTH_USERNAME")
+    basic_auth_password = os.environ.get("BASIC_AUTH_PASSWORD")
+
+    if basic_auth_token:
+        return {"Authorization": f"Basic {basic_auth_token}"}
+    if basic_auth_username and basic_auth_password:
+        credentials_string = f"{basic_auth_username}:{basic_auth_password}"
+        encoded_credentials = base64.b64encode(credentials_string.encode()).decode()
+        return {"Authorization": f"Basic {encoded_credentials}"}
+    return {}
+
+
 def format_datetime_for_upload_link(now: datetime) -> str:
     am_or_pm = now.strftime(format="%p").lower()
 
@@ -180,14 +198,7 @@ DEFAULT_TIMEOUT_SECONDS = 30
 def reload_until_element_is_visible(
     page: Page, tag: Locator, seconds: int = DEFAULT_TIMEOUT_SECONDS
 ) -> None:
-    for _ in range(seconds * 2):
-        if tag.is_visible():
-            break
-
-        time.sleep(0.5)
-
-        page.reload()
-    else:
+    if not reload_until(page, tag.is_visible, seconds, f"{tag} is visible"):
         expect(tag).to_be_visible()
 
 
@@ -195,15 +206,52 @@ def reload_until_element_is_visible(
 def reload_until_element_is_not_visible(
     page: Page, tag: Locator, seconds: int = DEFAULT_TIMEOUT_SECONDS
 ) -> None:
-    for _ in range(seconds * 2):
-        if not tag.is_visible():
-            break
+    if not reload_until(
+        page, lambda: not tag.is_visible(), seconds, f"{tag} is not visible"
+    ):
+        expect(tag).to_be_hidden()
 
-        time.sleep(0.5)
 
-        page.reload()
-    else:
-        expect(tag).to_be_hidden()
+EXPECT_TIMEOUT_SECONDS = 5
+
+
+def _normalize_expected_text(text: str) -> str:
+    # the same normalisation Playwright applies in to_contain_text
+    return re.sub(r"\s+", " ", text.replace("\u200b", "")).strip()
+
+
+def expect_text_lines(
+    locator: Locator, lines: list[str], seconds: float = EXPECT_TIMEOUT_SECONDS
+) -> None:
+    """Expect the locator's text to contain each line, or not if it starts "!".
+
+    The text is read once per poll and every line is checked against it, so a
+    long list of lines costs one round trip to the browser rather than one
+    each. Lines stay satisfied once matched, as with one expect per line, and
+    polling continues only while some are still unmatched.
+    """
+    pending = [
+        (line.startswith("!"), _normalize_expected_text(line.removeprefix("!")))
+        for line in lines
+    ]
+    deadline = time.monotonic() + seconds
+
+    while True:
+        text = _normalize_expected_text(locator.text_content() or "")
+        pending = [
+            (negated, line) for negated, line in pending if (line in text) == negated
+        ]
+        if not pending or time.monotonic() > deadline:
+            break
+        time.sleep(0.25)
+
+    if pending:
+        failures = "\n".join(
+            f"  {'unexpected' if negated else 'missing'}: {line}"
+            for negated, line in pending
+        )
+        msg = f"{len(pending)} of {len(lines)} lines did not match:\n{failures}"
+        raise AssertionError(msg)
 
 
 def expect_alert_text(page: Page, text: str) -> None:
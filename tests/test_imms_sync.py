@@ -70,7 +70,12 @@ def test_create_imms_record_then_verify_on_children_page(
         vaccination_time=vaccination_time,
     )
 
-    SidekiqHelper().run_recurring_job(sidekiq_job_name)
+    sidekiq_helper = SidekiqHelper()
+    sidekiq_helper.run_recurring_job(sidekiq_job_name)
+    # the enqueue job fans out a search for each patient
+    sidekiq_helper.wait_for_queues_to_drain(
+        job_classes=["SearchVaccinationRecordsInNHSJob"]
+    )
 
     # Verify the child created via IMMS API is visible in MAVIS children page
     DashboardPage(page).navigate()
@@ -80,6 +80,7 @@ def setup_fixed_child_future_date(setup_session_with_file_upload):
     )
 
 
+@pytest.mark.login_journey
 def test_session_lifecycle(
     log_in_as_nurse,
     schools,
@@ -0,0 +1,81 @@
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from mavis.test.constants import Programme
+from mavis.test.data import FileGenerator, VaccsFileMapping
+from mavis.test.data_models import Child, Clinic, Organisation, School, User
+
+#  This script is designed to be run manually to check that rendering a
+#  vaccination template grows linearly with the number of rows, e.g.
+#  uv run python -m utils.002_benchmark_template_rendering
+row_counts = [5_000, 10_000, 25_000, 50_000]
+
+
+def build_file_generator() -> FileGenerator:
+    year_groups = {programme.group: programme.year_groups[0] for programme in Programme}
+    schools = {
+        programme.group: [
+            School(
+                name=f"Benchmark School {index}",
+                urn=str(100000 + index),
+                site="",
+                address_line_1="",
+                address_line_2="",
+                address_town="",
+                address_postcode="",
+            )
+            for index in range(2)
+        ]
+        for programme in Programme
+    }
+    return FileGenerator(
+        organisation=Organisation.generate(),
+        schools=schools,
+        nurse=User.generate("nurse"),
+        children=Child.generate_children_in_year_group_for_each_programme_group(
+            2, year_groups
+        ),
+        clinics=[Clinic.generate()],
+        year_groups=year_groups,
+    )
+
+
+def build_template(source: Path, destination: Path, rows: int) -> None:
+    source_df = pd.read_csv(source, dtype=str)
+    repeats = -(-rows // len(source_df))
+    template_df = pd.concat([source_df] * repeats, ignore_index=True).head(rows)
+    template_df.to_csv(destination, index=False)
+
+
+def benchmark() -> None:
+    file_generator = build_file_generator()
+    source = (
+        file_generator.template_path / VaccsFileMapping.POSITIVE.input_template_path
+    )
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in row_counts:
+            template = Path(directory) / f"i_benchmark_{rows}.csv"
+            build_template(source, template, rows)
+
+            start = time.perf_counter()
+            output = file_generator.create_file_from_template(template, "benchmark")
+            elapsed = time.perf_counter() - start
+            output.unlink()
+
+            results.append((rows, elapsed))
+            print(
+                f"{rows:>7} rows: {elapsed:8.3f}s ({elapsed / rows * 1e6:7.1f}us/row)"
+            )
+
+    (first_rows, first_elapsed), (last_rows, last_elapsed) = results[0], results[-1]
+    ratio = (last_elapsed / last_rows) / (first_elapsed / first_rows)
+    print(f"per-row cost at {last_rows} rows vs {first_rows} rows: {ratio:.2f}x")
+
+
+if __name__ == "__main__":
+    benchmark()
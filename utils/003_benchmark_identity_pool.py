@@ -0,0 +1,54 @@
+import time
+from collections.abc import Callable
+
+from faker import Faker
+
+from mavis.test.identities import IdentityPool
+from mavis.test.utils import normalize_postcode
+
+#  This script is designed to be run manually to compare per-value Faker calls
+#  with the pooled identity provider, e.g.
+#  uv run python -m utils.003_benchmark_identity_pool
+values = 100_000
+
+
+def measure(generate: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    for _ in range(values):
+        generate()
+    return time.perf_counter() - start
+
+
+def benchmark() -> None:
+    faker = Faker(locale="en_GB")
+    pool = IdentityPool()
+
+    cases = {
+        "first name": (faker.first_name, pool.first_name),
+        "last name": (faker.last_name, pool.last_name),
+        "parent name": (faker.name_female, pool.name_female),
+        "email": (faker.email, pool.email),
+        "postcode": (lambda: normalize_postcode(faker.postcode()), pool.postcode),
+        "address": (
+            lambda: (
+                faker.secondary_address(),
+                faker.street_name(),
+                faker.city(),
+                normalize_postcode(faker.postcode()),
+            ),
+            pool.address,
+        ),
+    }
+
+    print(f"{values} values each")
+    for name, (faker_generate, pool_generate) in cases.items():
+        faker_elapsed = measure(faker_generate)
+        pool_elapsed = measure(pool_generate)
+        print(
+            f"{name:>12}: faker {faker_elapsed:6.2f}s, pool {pool_elapsed:6.2f}s "
+            f"({faker_elapsed / pool_elapsed:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    benchmark()
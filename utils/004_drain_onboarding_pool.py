@@ -0,0 +1,28 @@
+import os
+
+from dotenv import load_dotenv
+
+from mavis.test.fixtures.team_reset import delete_teams
+from mavis.test.onboarding import OnboardedTenant, onboarded_tenant_pool
+
+#  This script is designed to be run manually to delete the teams kept in the
+#  onboarding pool (see ONBOARDING_POOL_SIZE) once they are no longer needed, e.g.
+#  uv run python -m utils.004_drain_onboarding_pool
+
+
+def drain() -> None:
+    load_dotenv()
+    base_url = os.environ["BASE_URL"]
+    programmes = os.environ["PROGRAMMES_ENABLED"].lower().split(",")
+
+    def delete(tenant: OnboardedTenant) -> None:
+        delete_teams(
+            base_url, tenant.point_of_care.team, tenant.national_reporting.team
+        )
+
+    deleted = onboarded_tenant_pool(base_url, programmes).drain(delete)
+    print(f"Deleted {deleted} pooled onboarding tenants")
+
+
+if __name__ == "__main__":
+    drain()